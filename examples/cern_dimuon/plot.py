@@ -4,38 +4,35 @@ Create CERN dimuon fit figures from examples/cern_dimuon/output/cern_*_curve.csv
 """
 
 from pathlib import Path
-import csv
 
 import matplotlib
+import numpy as np
 
 matplotlib.use("Agg")
 import matplotlib.pyplot as plt
 
 
+CURVE_COLUMNS = ("bin_center", "count", "sigma", "model", "residual")
+
+
 def read_curve(path: Path):
-    x, y, yerr, m, r = [], [], [], [], []
     with path.open() as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            x.append(float(row["bin_center"]))
-            y.append(float(row["count"]))
-            yerr.append(float(row["sigma"]))
-            m.append(float(row["model"]))
-            r.append(float(row["residual"]))
-    return x, y, yerr, m, r
+        header = f.readline().strip().split(",")
+        cols = [header.index(name) for name in CURVE_COLUMNS]
+        return tuple(np.loadtxt(f, delimiter=",", usecols=cols, unpack=True, ndmin=2))
 
 
 def draw_panel(title: str, x, y, yerr, model, residual, out_path: Path) -> None:
     fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(10, 7), sharex=True)
 
-    ax1.errorbar(x, y, yerr=yerr, fmt="o", ms=3, lw=0.8, alpha=0.8, label="Data")
+    ax1.errorbar(x, y, yerr=yerr, fmt="o", ms=3, lw=0.8, alpha=0.8, label="Data", rasterized=True)
     ax1.plot(x, model, "-", lw=1.8, color="tab:red", label="Model")
     ax1.set_ylabel("Counts / bin")
     ax1.set_title(title)
     ax1.grid(alpha=0.3)
     ax1.legend(loc="best")
 
-    ax2.plot(x, residual, "o", ms=3, color="tab:purple")
+    ax2.plot(x, residual, "o", ms=3, color="tab:purple", rasterized=True)
     ax2.axhline(0.0, color="k", lw=1.0)
     ax2.set_xlabel("Invariant Mass (GeV)")
     ax2.set_ylabel("Residual")
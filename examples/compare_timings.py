@@ -14,22 +14,21 @@ from __future__ import annotations
 
 import argparse
 import csv
+import functools
 import json
 import math
 import os
 import platform
-import random
 import re
 import shutil
-import statistics
 import subprocess
+import threading
+from array import array
 from datetime import datetime, timezone
 from pathlib import Path
+from typing import Iterator
 
-import matplotlib
-
-matplotlib.use("Agg")
-import matplotlib.pyplot as plt
+import numpy as np
 
 
 CASES: list[tuple[str, str]] = [
@@ -38,87 +37,109 @@ CASES: list[tuple[str, str]] = [
     ("usgs_earthquakes", "USGS EQ"),
     ("cern_dimuon", "CERN dimuon"),
 ]
+IMPLS: tuple[str, ...] = ("rust", "cpp")
 
 
-def quantile(values: list[float], q: float) -> float:
-    if not values:
-        return float("nan")
-    if len(values) == 1:
-        return values[0]
-    s = sorted(values)
-    idx = q * (len(s) - 1)
-    lo = int(math.floor(idx))
-    hi = int(math.ceil(idx))
-    if lo == hi:
-        return s[lo]
-    w = idx - lo
-    return s[lo] * (1.0 - w) + s[hi] * w
-
-
-def bootstrap_median_ci(samples: list[float], iters: int, alpha: float, rng: random.Random) -> tuple[float, float]:
-    if len(samples) < 2:
-        v = statistics.median(samples) if samples else float("nan")
+def bootstrap_median_ci(samples: np.ndarray, iters: int, alpha: float, rng: np.random.Generator) -> tuple[float, float]:
+    arr = np.asarray(samples, dtype=np.float64)
+    n = arr.size
+    if n < 2:
+        v = float(arr[0]) if n else float("nan")
         return (v, v)
-    meds: list[float] = []
-    n = len(samples)
-    for _ in range(iters):
-        draw = [samples[rng.randrange(n)] for _ in range(n)]
-        meds.append(statistics.median(draw))
-    low = quantile(meds, alpha / 2.0)
-    high = quantile(meds, 1.0 - alpha / 2.0)
-    return (low, high)
-
-
-def permutation_pvalue_median(a: list[float], b: list[float], iters: int, rng: random.Random) -> float:
+    # Draw every resample at once: row i of `idx` is bootstrap replicate i.
+    idx = rng.integers(0, n, size=(iters, n))
+    meds = np.median(arr[idx], axis=1)
+    low, high = np.quantile(meds, [alpha / 2.0, 1.0 - alpha / 2.0])
+    return (float(low), float(high))
+
+
+def wilson_interval(successes: int, trials: int, z: float) -> tuple[float, float]:
+    if trials <= 0:
+        return (0.0, 1.0)
+    p = successes / trials
+    denom = 1.0 + z * z / trials
+    center = (p + z * z / (2.0 * trials)) / denom
+    half = z * math.sqrt(p * (1.0 - p) / trials + z * z / (4.0 * trials * trials)) / denom
+    return (max(0.0, center - half), min(1.0, center + half))
+
+
+def permutation_pvalue_median(
+    a: np.ndarray,
+    b: np.ndarray,
+    iters: int,
+    rng: np.random.Generator,
+    alpha: float = 0.05,
+    z: float = 2.576,
+) -> float:
+    """Permutation p-value for |median(a) - median(b)| with sequential early stopping.
+
+    Permutations run in blocks; once the Wilson interval (default 99%) on the
+    running p-value lies entirely above or below `alpha`, the decision cannot
+    change and the remaining permutations are skipped. `iters` is the cap.
+    """
     if len(a) < 2 or len(b) < 2:
         return float("nan")
-    obs = abs(statistics.median(a) - statistics.median(b))
-    combined = a + b
+    obs = abs(np.median(a) - np.median(b))
+    combined = np.concatenate([a, b]).astype(np.float64, copy=False)
     na = len(a)
     count = 0
-    for _ in range(iters):
-        rng.shuffle(combined)
-        d = abs(statistics.median(combined[:na]) - statistics.median(combined[na:]))
-        if d >= obs:
-            count += 1
-    return (count + 1.0) / (iters + 1.0)
-
-
-def median_abs_deviation(samples: list[float]) -> float:
-    if not samples:
+    total = 0
+    # Shuffle in fixed-size blocks so memory stays bounded at large `iters`.
+    block = 1024
+    while total < iters:
+        rows = min(block, iters - total)
+        shuffled = rng.permuted(np.broadcast_to(combined, (rows, combined.size)), axis=1)
+        d = np.abs(np.median(shuffled[:, :na], axis=1) - np.median(shuffled[:, na:], axis=1))
+        count += int(np.count_nonzero(d >= obs))
+        total += rows
+        lo, hi = wilson_interval(count + 1, total + 1, z)
+        if hi < alpha or lo > alpha:
+            break
+    return (count + 1.0) / (total + 1.0)
+
+
+def median_abs_deviation(samples: list[float] | np.ndarray) -> float:
+    if len(samples) == 0:
         return float("nan")
-    m = statistics.median(samples)
-    return statistics.median([abs(v - m) for v in samples])
+    arr = np.asarray(samples, dtype=np.float64)
+    return float(np.median(np.abs(arr - np.median(arr))))
 
 
-def trimmed(values: list[float], trim_fraction: float) -> list[float]:
-    if not values:
-        return []
-    if trim_fraction <= 0.0:
-        return sorted(values)
-    s = sorted(values)
-    k = int(len(s) * trim_fraction)
-    if 2 * k >= len(s):
-        return s
-    return s[k : len(s) - k]
+def trimmed(values: list[float] | np.ndarray, trim_fraction: float) -> np.ndarray:
+    """Values left after dropping `trim_fraction` from each tail (kept values are not sorted)."""
+    arr = np.asarray(values, dtype=np.float64)
+    n = arr.size
+    k = int(n * trim_fraction) if trim_fraction > 0.0 else 0
+    if k == 0 or 2 * k >= n:
+        return arr.copy()
+    # Linear-time selection: only the two cut points need to land in place.
+    return np.partition(arr, [k, n - k - 1])[k : n - k]
 
 
-def trimmed_median(values: list[float], trim_fraction: float) -> float:
+def trimmed_median(values: list[float] | np.ndarray, trim_fraction: float) -> float:
     t = trimmed(values, trim_fraction)
-    if not t:
+    if t.size == 0:
         return float("nan")
-    return statistics.median(t)
+    return float(np.median(t))
+
+
+BENCH_TIMES_PREFIX = "BENCH_TIMES_S:"
+
+
+def parse_bench_times(line: str) -> np.ndarray:
+    # One C-level parse of the comma-separated payload; a trailing comma is tolerated.
+    payload = line[len(BENCH_TIMES_PREFIX) :].strip().strip(",")
+    return np.fromstring(payload, dtype=np.float64, sep=",")
 
 
-def parse_bench_times(stdout: str, stderr: str, cmd: list[str]) -> list[float]:
-    merged = f"{stdout}\n{stderr}"
-    for line in merged.splitlines():
-        if line.startswith("BENCH_TIMES_S:"):
-            payload = line.split(":", 1)[1].strip()
-            if not payload:
-                return []
-            return [float(x) for x in payload.split(",") if x]
-    raise RuntimeError(f"benchmark output missing BENCH_TIMES_S line for command: {' '.join(cmd)}")
+SAMPLE_FIELDS = ("case_id", "impl", "batch_id", "sample_index", "time_s")
+
+
+def sample_rows(case: str, impl: str, batch_id: int, vals: np.ndarray) -> Iterator[tuple[str, str, str, str, str]]:
+    """Positional comparison_samples.csv rows (in SAMPLE_FIELDS order) for one benchmark job."""
+    batch = str(batch_id)
+    for i, v in enumerate(vals.tolist()):
+        yield (case, impl, batch, str(i), f"{v:.9f}")
 
 
 def run_capture(cmd: list[str]) -> tuple[int, str, str]:
@@ -133,6 +154,52 @@ def first_non_empty_line(text: str) -> str:
     return ""
 
 
+CPU_SYSFS = "/sys/devices/system/cpu"
+
+
+def read_sysfs_value(path: str) -> str | None:
+    """Stripped contents of a small sysfs file, or None if it cannot be read."""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return None
+    try:
+        return os.read(fd, 64).decode("utf-8", "replace").strip()
+    except OSError:
+        return None
+    finally:
+        os.close(fd)
+
+
+@functools.lru_cache(maxsize=None)
+def linux_cpu_state() -> tuple[str, tuple[str, ...], str | None]:
+    """CPU model, sorted unique governors and intel_pstate no_turbo; read once per process."""
+    model = ""
+    try:
+        # The first processor record always carries a `model name` line.
+        with open("/proc/cpuinfo", "rb") as f:
+            head = f.read(8192)
+        m = re.search(rb"^model name\s*:\s*(.+)$", head, re.MULTILINE)
+        if m:
+            model = m.group(1).decode("utf-8", "replace").strip()
+    except OSError:
+        pass
+
+    governors: set[str] = set()
+    try:
+        cpu_entries = [e.name for e in os.scandir(CPU_SYSFS) if e.name.startswith("cpu")]
+    except OSError:
+        cpu_entries = []
+    for name in cpu_entries:
+        governor = read_sysfs_value(f"{CPU_SYSFS}/{name}/cpufreq/scaling_governor")
+        if governor:
+            governors.add(governor)
+
+    no_turbo = read_sysfs_value(f"{CPU_SYSFS}/intel_pstate/no_turbo")
+
+    return model, tuple(sorted(governors)), no_turbo
+
+
 def collect_environment(cpu_core: int | None, strict_env: bool) -> tuple[dict[str, object], list[str], list[str], bool]:
     env: dict[str, object] = {
         "timestamp_utc": datetime.now(timezone.utc).isoformat(),
@@ -163,32 +230,8 @@ def collect_environment(cpu_core: int | None, strict_env: bool) -> tuple[dict[st
     }
 
     if system == "Linux":
-        model = ""
-        try:
-            with open("/proc/cpuinfo", "r", encoding="utf-8") as f:
-                for line in f:
-                    if line.startswith("model name"):
-                        model = line.split(":", 1)[1].strip()
-                        break
-        except OSError:
-            pass
-
-        governors: list[str] = []
-        gov_paths = sorted(Path("/sys/devices/system/cpu").glob("cpu*/cpufreq/scaling_governor"))
-        for gp in gov_paths:
-            try:
-                governors.append(gp.read_text(encoding="utf-8").strip())
-            except OSError:
-                continue
-        unique_governors = sorted(set(g for g in governors if g))
-
-        no_turbo = None
-        no_turbo_path = Path("/sys/devices/system/cpu/intel_pstate/no_turbo")
-        if no_turbo_path.exists():
-            try:
-                no_turbo = no_turbo_path.read_text(encoding="utf-8").strip()
-            except OSError:
-                pass
+        model, governor_set, no_turbo = linux_cpu_state()
+        unique_governors = list(governor_set)
 
         env["linux"] = {
             "cpu_model": model,
@@ -209,9 +252,14 @@ def collect_environment(cpu_core: int | None, strict_env: bool) -> tuple[dict[st
             rc, out, _ = run_capture(["sysctl", "-n", key])
             return out.strip() if rc == 0 else ""
 
-        brand = sysctl_value("machdep.cpu.brand_string")
-        ncpu = sysctl_value("hw.ncpu")
-        perflevel = sysctl_value("hw.perflevel0.physicalcpu")
+        sysctl_keys = ["machdep.cpu.brand_string", "hw.ncpu", "hw.perflevel0.physicalcpu"]
+        rc, out, _ = run_capture(["sysctl", "-n", *sysctl_keys])
+        values = out.splitlines()
+        if rc != 0 or len(values) != len(sysctl_keys):
+            # A missing key (e.g. no perflevels on Intel Macs) breaks the
+            # one-value-per-line alignment, so query each key on its own.
+            values = [sysctl_value(key) for key in sysctl_keys]
+        brand, ncpu, perflevel = (v.strip() for v in values)
 
         rc_custom, out_custom, _ = run_capture(["pmset", "-g", "custom"])
         low_power_mode = None
@@ -262,13 +310,35 @@ def collect_environment(cpu_core: int | None, strict_env: bool) -> tuple[dict[st
     return env, warnings, critical, taskset_available
 
 
-def run_bench(cmd: list[str], cwd: Path, cpu_core: int | None, taskset_available: bool) -> list[float]:
+def run_bench(cmd: list[str], cwd: Path, cpu_core: int | None, taskset_available: bool) -> np.ndarray:
     wrapped = cmd
     if cpu_core is not None and platform.system() == "Linux" and taskset_available:
         wrapped = ["taskset", "-c", str(cpu_core), *cmd]
 
-    p = subprocess.run(wrapped, cwd=cwd, check=True, capture_output=True, text=True)
-    return parse_bench_times(p.stdout, p.stderr, wrapped)
+    # Stream stdout instead of buffering it: only the BENCH_TIMES_S line is kept.
+    with subprocess.Popen(
+        wrapped,
+        cwd=cwd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+        bufsize=1,
+    ) as p:
+        stderr_lines: list[str] = []
+        drain = threading.Thread(target=lambda: stderr_lines.extend(p.stderr), daemon=True)
+        drain.start()
+        vals: np.ndarray | None = None
+        for line in p.stdout:
+            if vals is None and line.startswith(BENCH_TIMES_PREFIX):
+                vals = parse_bench_times(line)
+        rc = p.wait()
+        drain.join()
+
+    if rc != 0:
+        raise subprocess.CalledProcessError(rc, wrapped, stderr="".join(stderr_lines))
+    if vals is None:
+        raise RuntimeError(f"benchmark output missing {BENCH_TIMES_PREFIX} line for command: {' '.join(wrapped)}")
+    return vals
 
 
 def main() -> None:
@@ -281,7 +351,7 @@ def main() -> None:
         "--permutation-iters",
         type=int,
         default=10000,
-        help="permutation-test iterations for p-value on median difference",
+        help="max permutation-test iterations for p-value on median difference (stops early once decisive at alpha=0.05)",
     )
     parser.add_argument("--trim-fraction", type=float, default=0.10, help="fraction trimmed on each tail for robust median")
     parser.add_argument("--cpu-core", type=int, default=None, help="pin jobs to this CPU core (Linux only via taskset)")
@@ -299,7 +369,7 @@ def main() -> None:
     trim_fraction = max(0.0, min(0.24, args.trim_fraction))
     bootstrap_iters = max(200, args.bootstrap_iters)
     permutation_iters = max(500, args.permutation_iters)
-    rng = random.Random(args.seed)
+    rng = np.random.default_rng(args.seed)
 
     repo = Path(__file__).resolve().parents[1]
     out_dir = repo / "examples" / "output"
@@ -337,78 +407,76 @@ def main() -> None:
         if not rust_bins[case].exists():
             raise FileNotFoundError(f"Rust timing binary not found: {rust_bins[case]}")
 
-    samples: dict[str, dict[str, list[float]]] = {case: {"rust": [], "cpp": []} for case, _ in CASES}
-    raw_rows: list[dict[str, str]] = []
+    # All measured samples in one (case, impl, sample) array, filled batch by batch.
+    case_index = {case: ci for ci, (case, _) in enumerate(CASES)}
+    impl_index = {impl: ii for ii, impl in enumerate(IMPLS)}
+    times = np.empty((len(CASES), len(IMPLS), batches * repeats), dtype=np.float64)
+    filled = np.zeros((len(CASES), len(IMPLS)), dtype=np.intp)
 
     schedule: list[tuple[str, str, int]] = []
     for case, _ in CASES:
         for b in range(batches):
             schedule.append((case, "rust", b))
             schedule.append((case, "cpp", b))
-    rng.shuffle(schedule)
-
-    for case, impl, batch_id in schedule:
-        if impl == "rust":
-            cmd = [
-                str(rust_bins[case]),
-                "--mode",
-                "solve-only",
-                "--bench-repeats",
-                str(repeats),
-                "--bench-warmups",
-                str(warmups),
-            ]
-        else:
-            cmd = [
-                str(cpp_bin),
-                "--case",
-                case,
-                "--mode",
-                "solve-only",
-                "--bench-repeats",
-                str(repeats),
-                "--bench-warmups",
-                str(warmups),
-            ]
-
-        vals = run_bench(cmd, repo, args.cpu_core, taskset_available)
-        if len(vals) != repeats:
-            raise RuntimeError(
-                f"expected {repeats} benchmark samples, got {len(vals)} for case={case} impl={impl} batch={batch_id}"
-            )
-
-        samples[case][impl].extend(vals)
-        for i, v in enumerate(vals):
-            raw_rows.append(
-                {
-                    "case_id": case,
-                    "impl": impl,
-                    "batch_id": str(batch_id),
-                    "sample_index": str(i),
-                    "time_s": f"{v:.9f}",
-                }
-            )
-
-    with samples_path.open("w", newline="") as f:
-        writer = csv.DictWriter(f, fieldnames=["case_id", "impl", "batch_id", "sample_index", "time_s"])
-        writer.writeheader()
-        writer.writerows(raw_rows)
+    schedule = [schedule[i] for i in rng.permutation(len(schedule))]
+
+    # Sample rows are written between jobs, never while a benchmark runs: the
+    # parent process is not pinned, so a writer thread could share the measured core.
+    with samples_path.open("w", newline="") as samples_file:
+        writer = csv.writer(samples_file)
+        writer.writerow(SAMPLE_FIELDS)
+        for case, impl, batch_id in schedule:
+            if impl == "rust":
+                cmd = [
+                    str(rust_bins[case]),
+                    "--mode",
+                    "solve-only",
+                    "--bench-repeats",
+                    str(repeats),
+                    "--bench-warmups",
+                    str(warmups),
+                ]
+            else:
+                cmd = [
+                    str(cpp_bin),
+                    "--case",
+                    case,
+                    "--mode",
+                    "solve-only",
+                    "--bench-repeats",
+                    str(repeats),
+                    "--bench-warmups",
+                    str(warmups),
+                ]
+
+            vals = run_bench(cmd, repo, args.cpu_core, taskset_available)
+            if len(vals) != repeats:
+                raise RuntimeError(
+                    f"expected {repeats} benchmark samples, got {len(vals)} for case={case} impl={impl} batch={batch_id}"
+                )
+
+            ci, ii = case_index[case], impl_index[impl]
+            cursor = filled[ci, ii]
+            times[ci, ii, cursor : cursor + repeats] = vals
+            filled[ci, ii] = cursor + repeats
+            writer.writerows(sample_rows(case, impl, batch_id, vals))
 
     rows: list[dict[str, str]] = []
     labels: list[str] = []
-    medians_rust: list[float] = []
-    medians_cpp: list[float] = []
-    err_low_rust: list[float] = []
-    err_high_rust: list[float] = []
-    err_low_cpp: list[float] = []
-    err_high_cpp: list[float] = []
-
-    for case, label in CASES:
-        rust_times = samples[case]["rust"]
-        cpp_times = samples[case]["cpp"]
-
-        rust_med = statistics.median(rust_times)
-        cpp_med = statistics.median(cpp_times)
+    # Packed doubles: matplotlib's np.asarray on these is a buffer copy, not a per-item unbox.
+    medians_rust = array("d")
+    medians_cpp = array("d")
+    err_low_rust = array("d")
+    err_high_rust = array("d")
+    err_low_cpp = array("d")
+    err_high_cpp = array("d")
+
+    for ci, (case, label) in enumerate(CASES):
+        rust_times = times[ci, impl_index["rust"]]
+        cpp_times = times[ci, impl_index["cpp"]]
+
+        rust_med = float(np.median(rust_times))
+        cpp_med = float(np.median(cpp_times))
         rust_ci_lo, rust_ci_hi = bootstrap_median_ci(rust_times, bootstrap_iters, 0.05, rng)
         cpp_ci_lo, cpp_ci_hi = bootstrap_median_ci(cpp_times, bootstrap_iters, 0.05, rng)
         rust_trim_med = trimmed_median(rust_times, trim_fraction)
@@ -480,6 +548,13 @@ def main() -> None:
 
     env_path.write_text(json.dumps(env, indent=2) + "\n", encoding="utf-8")
 
+    # Matplotlib is imported only once all benchmark jobs and CSV outputs are done,
+    # so runs that fail early (missing binaries, strict env checks) skip its import cost.
+    import matplotlib
+
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
     x = list(range(len(labels)))
     width = 0.38
     fig, ax = plt.subplots(figsize=(11, 6))
@@ -518,9 +593,9 @@ def main() -> None:
     ax.set_xticklabels(labels)
     ax.grid(axis="y", alpha=0.3)
 
-    max_r = max(m + e for m, e in zip(medians_rust, err_high_rust, strict=False))
-    max_c = max(m + e for m, e in zip(medians_cpp, err_high_cpp, strict=False))
-    y_top = max(max_r, max_c) * 1.30
+    # nanmax: a case with degenerate (NaN) CI bounds must not poison the axis limit.
+    bar_tops = np.concatenate([np.add(medians_rust, err_high_rust), np.add(medians_cpp, err_high_cpp)])
+    y_top = float(np.nanmax(bar_tops)) * 1.30
     ax.set_ylim(0.0, y_top)
     ax.legend(loc="upper center", bbox_to_anchor=(0.5, 1.0), ncol=2)
 
@@ -7,21 +7,20 @@ from pathlib import Path
 import csv
 
 import matplotlib
+import numpy as np
 
 matplotlib.use("Agg")
 import matplotlib.pyplot as plt
 
 
+CURVE_COLUMNS = ("x", "observed", "fitted", "residual")
+
+
 def read_curve(path: Path):
-    x, y, yfit, res = [], [], [], []
     with path.open() as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            x.append(float(row["x"]))
-            y.append(float(row["observed"]))
-            yfit.append(float(row["fitted"]))
-            res.append(float(row["residual"]))
-    return x, y, yfit, res
+        header = f.readline().strip().split(",")
+        cols = [header.index(name) for name in CURVE_COLUMNS]
+        return tuple(np.loadtxt(f, delimiter=",", usecols=cols, unpack=True, ndmin=2))
 
 
 def main() -> None:
@@ -60,7 +59,6 @@ def main() -> None:
     fig.suptitle("NIST StRD Fits and Residuals")
     fig.tight_layout()
     fig.savefig(fig_dir / "nist_strd_fits.png", dpi=220)
-    plt.close(fig)
 
     summary_path = out / "nist_summary.csv"
     labels, vals = [], []
@@ -71,7 +69,10 @@ def main() -> None:
                 labels.append(f"{row['dataset']}:{row['param']}")
                 vals.append(float(row["rel_error"]))
 
-    fig2, ax = plt.subplots(figsize=(13, 5))
+    # Reuse the figure for the second plot instead of creating a new one.
+    fig.clf()
+    fig.set_size_inches(13, 5)
+    ax = fig.subplots()
     ax.bar(range(len(vals)), vals, color="tab:blue")
     ax.set_yscale("log")
     ax.set_title("NIST Parameter Relative Error vs Certified Values")
@@ -79,9 +80,9 @@ def main() -> None:
     ax.set_xticks(range(len(labels)))
     ax.set_xticklabels(labels, rotation=75, ha="right")
     ax.grid(axis="y", alpha=0.3)
-    fig2.tight_layout()
-    fig2.savefig(fig_dir / "nist_strd_rel_error.png", dpi=220)
-    plt.close(fig2)
+    fig.tight_layout()
+    fig.savefig(fig_dir / "nist_strd_rel_error.png", dpi=220)
+    plt.close(fig)
 
 
 if __name__ == "__main__":
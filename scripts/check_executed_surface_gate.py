@@ -11,13 +11,17 @@ from __future__ import annotations
 
 import argparse
 import csv
+import sys
 from collections import Counter
 from pathlib import Path
+from typing import Iterable, Iterator
 
 
 REPO_ROOT = Path(__file__).resolve().parents[1]
 DEFAULT_GAPS = REPO_ROOT / "reports" / "verification" / "executed_surface_gaps.csv"
 DEFAULT_BASELINE = REPO_ROOT / "verification" / "traceability" / "executed_surface_gaps_baseline.csv"
+GAP_ID_COLUMNS = ("upstream_file", "upstream_symbol", "function_mangled")
+HIGH_PRIORITIES = frozenset({"P0", "P1"})
 
 
 def parse_args() -> argparse.Namespace:
@@ -28,60 +32,76 @@ def parse_args() -> argparse.Namespace:
     return parser.parse_args()
 
 
-def read_gaps(path: Path) -> list[dict[str, str]]:
+def iter_gaps(path: Path) -> Iterator[tuple[str, str | None]]:
+    """Stream `(gap_priority, gap_id)` per row; gap_id is only built for P0/P1 rows."""
     if not path.exists():
         raise FileNotFoundError(f"gaps csv not found: {path}")
-    with path.open(newline="") as f:
-        rows = list(csv.DictReader(f))
-    required = {"upstream_file", "upstream_symbol", "function_mangled", "gap_priority"}
-    missing = required - set(rows[0].keys() if rows else required)
-    if rows and missing:
-        raise ValueError(f"gaps csv missing columns: {sorted(missing)}")
-    return rows
-
-
-def gap_id(row: dict[str, str]) -> str:
-    return (
-        f"{row.get('upstream_file', '').strip()}::"
-        f"{row.get('upstream_symbol', '').strip()}::"
-        f"{row.get('function_mangled', '').strip()}"
-    )
-
-
-def high_priority_ids(rows: list[dict[str, str]]) -> set[str]:
-    return {
-        gap_id(r)
-        for r in rows
-        if r.get("gap_priority", "").strip() in {"P0", "P1"}
-    }
+    return _iter_gap_rows(path)
 
 
-def priority_counts(rows: list[dict[str, str]]) -> Counter[str]:
-    out = Counter()
-    for row in rows:
-        out[row.get("gap_priority", "").strip()] += 1
-    return out
-
-
-def run_strict(rows: list[dict[str, str]]) -> int:
-    counts = priority_counts(rows)
-    high = counts["P0"] + counts["P1"]
+def _iter_gap_rows(path: Path) -> Iterator[tuple[str, str | None]]:
+    with path.open(newline="") as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            return
+        missing = {*GAP_ID_COLUMNS, "gap_priority"} - set(header)
+        if missing:
+            raise ValueError(f"gaps csv missing columns: {sorted(missing)}")
+        i_file, i_symbol, i_mangled = (header.index(c) for c in GAP_ID_COLUMNS)
+        i_priority = header.index("gap_priority")
+        for row in reader:
+            if not row:
+                continue
+            priority = sys.intern(row[i_priority].strip())
+            if priority in HIGH_PRIORITIES:
+                yield priority, gap_id(row[i_file], row[i_symbol], row[i_mangled])
+            else:
+                yield priority, None
+
+
+def gap_id(upstream_file: str, upstream_symbol: str, function_mangled: str) -> str:
+    return "::".join((upstream_file.strip(), upstream_symbol.strip(), function_mangled.strip()))
+
+
+def summarize_gaps(
+    gaps: Iterable[tuple[str, str | None]],
+    known_ids: frozenset[str] = frozenset(),
+) -> tuple[Counter[str], set[str]]:
+    """Priority counts plus the P0/P1 gap IDs not already in `known_ids`, in one pass."""
+    counts: Counter[str] = Counter()
+    high_ids: set[str] = set()
+    for priority, gid in gaps:
+        counts[priority] += 1
+        if gid is not None and gid not in known_ids:
+            high_ids.add(gid)
+    return counts, high_ids
+
+
+def run_strict(gaps: Iterable[tuple[str, str | None]]) -> int:
+    # Stop at the first P0/P1 row; full totals are only needed on the pass path.
+    counts: Counter[str] = Counter()
+    for priority, gid in gaps:
+        if gid is not None:
+            print(f"Executed-surface summary: first {priority} gap {gid} (remaining rows not scanned)")
+            print("FAIL: strict executed-surface gate requires P0 == 0 and P1 == 0")
+            return 1
+        counts[priority] += 1
     print(
         "Executed-surface summary: "
         f"P0={counts['P0']} P1={counts['P1']} P2={counts['P2']}"
     )
-    if high > 0:
-        print("FAIL: strict executed-surface gate requires P0 == 0 and P1 == 0")
-        return 1
     print("PASS: strict executed-surface gate")
     return 0
 
 
-def run_non_regression(current_rows: list[dict[str, str]], baseline_rows: list[dict[str, str]]) -> int:
-    cur_counts = priority_counts(current_rows)
-    base_counts = priority_counts(baseline_rows)
-    cur_ids = high_priority_ids(current_rows)
-    base_ids = high_priority_ids(baseline_rows)
+def run_non_regression(
+    current_gaps: Iterable[tuple[str, str | None]],
+    baseline_gaps: Iterable[tuple[str, str | None]],
+) -> int:
+    base_counts, base_ids = summarize_gaps(baseline_gaps)
+    # Only current IDs missing from the baseline are kept, so this set stays small.
+    cur_counts, new_ids = summarize_gaps(current_gaps, frozenset(base_ids))
 
     print(
         "Current summary: "
@@ -94,7 +114,7 @@ def run_non_regression(current_rows: list[dict[str, str]], baseline_rows: list[d
 
     failed = False
 
-    new_high = sorted(cur_ids - base_ids)
+    new_high = sorted(new_ids)
     if new_high:
         failed = True
         print(f"FAIL: {len(new_high)} new P0/P1 executed-surface gaps introduced")
@@ -117,13 +137,13 @@ def run_non_regression(current_rows: list[dict[str, str]], baseline_rows: list[d
 
 def main() -> int:
     args = parse_args()
-    current_rows = read_gaps(Path(args.gaps))
+    current_gaps = iter_gaps(Path(args.gaps))
 
     if args.mode == "strict":
-        return run_strict(current_rows)
+        return run_strict(current_gaps)
 
-    baseline_rows = read_gaps(Path(args.baseline))
-    return run_non_regression(current_rows, baseline_rows)
+    baseline_gaps = iter_gaps(Path(args.baseline))
+    return run_non_regression(current_gaps, baseline_gaps)
 
 
 if __name__ == "__main__":
@@ -11,13 +11,16 @@ from __future__ import annotations
 
 import argparse
 import csv
+import sys
 from collections import Counter
 from pathlib import Path
+from typing import Iterable, Iterator
 
 
 REPO_ROOT = Path(__file__).resolve().parents[1]
 DEFAULT_MATRIX = REPO_ROOT / "reports" / "verification" / "traceability_matrix.csv"
 DEFAULT_BASELINE = REPO_ROOT / "verification" / "traceability" / "traceability_baseline.csv"
+RESOLVED_STATUSES = frozenset({"implemented", "waived"})
 
 
 def parse_args() -> argparse.Namespace:
@@ -28,82 +31,92 @@ def parse_args() -> argparse.Namespace:
     return parser.parse_args()
 
 
-def read_matrix(path: Path) -> dict[str, dict[str, str]]:
+def iter_matrix(path: Path) -> Iterator[tuple[str, str]]:
+    """Stream `(legacy_id, stripped effective_status)`, reading only the two needed columns."""
     if not path.exists():
         raise FileNotFoundError(f"matrix not found: {path}")
-    out: dict[str, dict[str, str]] = {}
+    return _iter_matrix_rows(path)
+
+
+def _iter_matrix_rows(path: Path) -> Iterator[tuple[str, str]]:
+    seen: set[str] = set()
     with path.open(newline="") as f:
-        reader = csv.DictReader(f)
+        reader = csv.reader(f)
+        header = next(reader, [])
         required = {"legacy_id", "effective_status"}
-        missing = required - set(reader.fieldnames or [])
+        missing = required - set(header)
         if missing:
             raise ValueError(f"matrix missing columns: {sorted(missing)}")
+        i_id = header.index("legacy_id")
+        i_status = header.index("effective_status")
         for row in reader:
-            legacy_id = row["legacy_id"]
-            if legacy_id in out:
+            if not row:
+                continue
+            legacy_id = row[i_id]
+            if legacy_id in seen:
                 raise ValueError(f"duplicate legacy_id in matrix: {legacy_id}")
-            out[legacy_id] = row
-    return out
+            seen.add(legacy_id)
+            yield legacy_id, sys.intern(row[i_status].strip())
+
 
+def read_matrix(path: Path) -> dict[str, str]:
+    return dict(iter_matrix(path))
 
-def unresolved_ids(rows: dict[str, dict[str, str]]) -> set[str]:
-    return {
-        legacy_id
-        for legacy_id, row in rows.items()
-        if row.get("effective_status", "").strip() == "unresolved"
-    }
 
+def unresolved_ids(rows: dict[str, str]) -> set[str]:
+    return {legacy_id for legacy_id, status in rows.items() if status == "unresolved"}
 
-def implemented_or_waived_ids(rows: dict[str, dict[str, str]]) -> set[str]:
-    return {
-        legacy_id
-        for legacy_id, row in rows.items()
-        if row.get("effective_status", "").strip() in {"implemented", "waived"}
-    }
 
+def implemented_or_waived_ids(rows: dict[str, str]) -> set[str]:
+    return {legacy_id for legacy_id, status in rows.items() if status in RESOLVED_STATUSES}
 
-def summarize(rows: dict[str, dict[str, str]]) -> Counter[str]:
-    return Counter(row.get("effective_status", "unknown") for row in rows.values())
 
+def summarize(rows: dict[str, str]) -> Counter[str]:
+    return Counter(rows.values())
 
-def run_strict(matrix: dict[str, dict[str, str]]) -> int:
-    counts = summarize(matrix)
-    unresolved = counts["unresolved"]
+
+def run_strict(entries: Iterable[tuple[str, str]]) -> int:
+    # Stop at the first unresolved row; full totals are only needed on the pass path.
+    counts: Counter[str] = Counter()
+    for legacy_id, status in entries:
+        if status == "unresolved":
+            print(f"Traceability summary: first unresolved legacy ID {legacy_id} (remaining rows not scanned)")
+            print("FAIL: strict traceability gate requires unresolved == 0")
+            return 1
+        counts[status] += 1
     print(
         "Traceability summary: "
         f"implemented={counts['implemented']} "
         f"waived={counts['waived']} "
-        f"unresolved={unresolved}"
+        f"unresolved={counts['unresolved']}"
     )
-    if unresolved > 0:
-        print("FAIL: strict traceability gate requires unresolved == 0")
-        return 1
     print("PASS: strict traceability gate")
     return 0
 
 
 def run_non_regression(
-    matrix: dict[str, dict[str, str]],
-    baseline: dict[str, dict[str, str]],
+    matrix: dict[str, str],
+    baseline: dict[str, str],
 ) -> int:
-    current_ids = set(matrix.keys())
-    baseline_ids = set(baseline.keys())
-
-    missing_from_current = sorted(baseline_ids - current_ids)
+    missing_from_current = sorted(legacy_id for legacy_id in baseline if legacy_id not in matrix)
     if missing_from_current:
         print(f"FAIL: {len(missing_from_current)} baseline legacy IDs missing in current matrix")
         print(f"Sample: {', '.join(missing_from_current[:5])}")
         return 1
 
-    baseline_unresolved = unresolved_ids(baseline)
-    current_unresolved = unresolved_ids(matrix)
-
-    new_unresolved = sorted(current_unresolved - baseline_unresolved)
-    regressed = sorted(
-        legacy_id
-        for legacy_id in (implemented_or_waived_ids(baseline) & current_ids)
-        if matrix[legacy_id].get("effective_status", "").strip() == "unresolved"
-    )
+    # One walk over the current matrix classifies every unresolved ID against its baseline status.
+    new_unresolved: list[str] = []
+    regressed: list[str] = []
+    for legacy_id, status in matrix.items():
+        if status != "unresolved":
+            continue
+        base_status = baseline.get(legacy_id)
+        if base_status != "unresolved":
+            new_unresolved.append(legacy_id)
+        if base_status in RESOLVED_STATUSES:
+            regressed.append(legacy_id)
+    new_unresolved.sort()
+    regressed.sort()
 
     counts_cur = summarize(matrix)
     counts_base = summarize(baseline)
@@ -148,11 +161,11 @@ def run_non_regression(
 
 def main() -> int:
     args = parse_args()
-    matrix = read_matrix(Path(args.matrix))
 
     if args.mode == "strict":
-        return run_strict(matrix)
+        return run_strict(iter_matrix(Path(args.matrix)))
 
+    matrix = read_matrix(Path(args.matrix))
     baseline = read_matrix(Path(args.baseline))
     return run_non_regression(matrix, baseline)
 
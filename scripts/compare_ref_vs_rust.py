@@ -16,9 +16,13 @@ from __future__ import annotations
 
 import argparse
 import csv
+import itertools
 import json
 import math
+import operator
+import os
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
@@ -29,6 +33,21 @@ DEFAULT_WORKLOADS = REPO_ROOT / "verification" / "workloads" / "root_minuit2_v6_
 DEFAULT_REF_BIN = REPO_ROOT / "third_party" / "root_ref_build" / "ref_runner" / "ref_runner"
 DEFAULT_REPORT_DIR = REPO_ROOT / "reports" / "verification"
 
+# Column order of diff_results.csv; rows are written as positional tuples.
+DIFF_FIELDNAMES = (
+    "workload",
+    "status",
+    "issues",
+    "warnings",
+    "fval_abs",
+    "edm_abs",
+    "max_param_abs",
+    "max_error_abs",
+    "max_cov_abs",
+    "minos_abs",
+    "nfcn_rel",
+)
+
 
 @dataclass
 class DiffOutcome:
@@ -44,9 +63,31 @@ class DiffOutcome:
     nfcn_rel: float
 
 
-def run_cmd(cmd: list[str]) -> str:
-    out = subprocess.check_output(cmd, cwd=REPO_ROOT, text=True)
-    return out.strip()
+def run_cmd(cmd: list[str]) -> bytes:
+    # Raw bytes go straight to json.loads, which detects UTF-8 itself.
+    return subprocess.check_output(cmd, cwd=REPO_ROOT)
+
+
+def resolve_rust_cmd(rust_cmd: str) -> list[str]:
+    if rust_cmd:
+        return rust_cmd.split()
+    # One `cargo build` up front instead of paying `cargo run` startup per workload.
+    # Cargo reports the built binary's path, which already accounts for
+    # CARGO_BUILD_TARGET, a configured target-dir and the platform's .exe suffix.
+    out = run_cmd(
+        ["cargo", "build", "--quiet", "--bin", "ref_compare_runner", "--message-format=json-render-diagnostics"]
+    )
+    for line in out.splitlines():
+        msg = json.loads(line)
+        if msg.get("reason") == "compiler-artifact" and msg.get("executable"):
+            return [msg["executable"], "--workload"]
+    raise RuntimeError("cargo build did not report a ref_compare_runner executable")
+
+
+def run_workload(wid: str, ref_bin: Path, rust_cmd_prefix: list[str]) -> tuple[dict[str, Any], dict[str, Any]]:
+    ref_out = run_cmd([str(ref_bin), "--workload", wid])
+    rust_out = run_cmd([*rust_cmd_prefix, wid])
+    return json.loads(ref_out), json.loads(rust_out)
 
 
 def write_json(path: Path, data: Any) -> None:
@@ -57,22 +98,29 @@ def write_json(path: Path, data: Any) -> None:
 def max_abs_diff(a: list[float], b: list[float]) -> float:
     if len(a) != len(b):
         return float("inf")
-    if not a:
-        return 0.0
-    return max(abs(x - y) for x, y in zip(a, b))
+    # map/operator keep the per-element work in C instead of a generator frame.
+    # Always a full scan: diff_results.csv reports the exact maximum, so stopping
+    # at the first tolerance violation would change the recorded value.
+    return max(map(abs, map(operator.sub, a, b)), default=0.0)
 
 
 def max_abs_diff_matrix(a: list[list[float]], b: list[list[float]]) -> float:
-    if len(a) != len(b):
+    """Max element-wise |a - b|.
+
+    Square inputs are covariance matrices, which both runners emit exactly
+    symmetric, so only the upper triangle (j >= i) is compared.
+    """
+    n = len(a)
+    if n != len(b):
+        return float("inf")
+    if any(len(ra) != len(rb) for ra, rb in zip(a, b)):
         return float("inf")
-    if not a:
-        return 0.0
+    square = all(len(ra) == n for ra in a)
     out = 0.0
-    for ra, rb in zip(a, b):
-        if len(ra) != len(rb):
-            return float("inf")
-        for xa, xb in zip(ra, rb):
-            out = max(out, abs(xa - xb))
+    for i, (ra, rb) in enumerate(zip(a, b)):
+        start = i if square else 0
+        diffs = map(abs, map(operator.sub, itertools.islice(ra, start, None), itertools.islice(rb, start, None)))
+        out = max(itertools.chain((out,), diffs))
     return out
 
 
@@ -187,10 +235,19 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--ref-bin", default=str(DEFAULT_REF_BIN), help="Path to reference C++ runner")
     parser.add_argument(
         "--rust-cmd",
-        default="cargo run --quiet --bin ref_compare_runner -- --workload",
-        help="Rust command prefix; workload id is appended as final argument",
+        default="",
+        help=(
+            "Rust command prefix; workload id is appended as final argument "
+            "(default: build ref_compare_runner once and invoke the binary directly)"
+        ),
     )
     parser.add_argument("--report-dir", default=str(DEFAULT_REPORT_DIR), help="Output report directory")
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=0,
+        help="Workloads run concurrently (0 = one per CPU, 1 = serial)",
+    )
     return parser.parse_args()
 
 
@@ -203,7 +260,8 @@ def main() -> int:
     if not ref_bin.exists():
         raise FileNotFoundError(f"reference runner not found: {ref_bin}")
 
-    spec = json.loads(workloads_path.read_text())
+    with workloads_path.open("rb") as f:
+        spec = json.load(f)
     workloads = spec["workloads"]
 
     raw_ref_dir = report_dir / "raw" / "ref"
@@ -211,65 +269,50 @@ def main() -> int:
     raw_ref_dir.mkdir(parents=True, exist_ok=True)
     raw_rust_dir.mkdir(parents=True, exist_ok=True)
 
-    rust_cmd_prefix = args.rust_cmd.split()
-    rows: list[dict[str, str]] = []
-
-    for w in workloads:
-        wid = w["id"]
-
-        ref_out = run_cmd([str(ref_bin), "--workload", wid])
-        rust_out = run_cmd([*rust_cmd_prefix, wid])
-
-        ref_json = json.loads(ref_out)
-        rust_json = json.loads(rust_out)
-
-        write_json(raw_ref_dir / f"{wid}.json", ref_json)
-        write_json(raw_rust_dir / f"{wid}.json", rust_json)
-
-        outcome = compare(ref_json, rust_json, w.get("tolerances", {}))
-
-        rows.append(
-            {
-                "workload": wid,
-                "status": outcome.status,
-                "issues": " | ".join(outcome.issues),
-                "warnings": " | ".join(outcome.warnings),
-                "fval_abs": f"{outcome.fval_abs:.6e}",
-                "edm_abs": f"{outcome.edm_abs:.6e}",
-                "max_param_abs": f"{outcome.max_param_abs:.6e}",
-                "max_error_abs": f"{outcome.max_error_abs:.6e}",
-                "max_cov_abs": f"{outcome.max_cov_abs:.6e}",
-                "minos_abs": f"{outcome.minos_abs:.6e}",
-                "nfcn_rel": f"{outcome.nfcn_rel:.6e}",
-            }
-        )
+    rust_cmd_prefix = resolve_rust_cmd(args.rust_cmd)
+    rows: list[tuple[str, ...]] = []
+    fmt_metric = "{:.6e}".format
+
+    # Workloads are independent subprocess pairs, so threads suffice to overlap them;
+    # Executor.map yields results in workload order, keeping the outputs deterministic.
+    jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+    jobs = max(1, min(jobs, len(workloads)))
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        results = pool.map(lambda w: run_workload(w["id"], ref_bin, rust_cmd_prefix), workloads)
+        for w, (ref_json, rust_json) in zip(workloads, results):
+            wid = w["id"]
+
+            write_json(raw_ref_dir / f"{wid}.json", ref_json)
+            write_json(raw_rust_dir / f"{wid}.json", rust_json)
+
+            outcome = compare(ref_json, rust_json, w.get("tolerances", {}))
+
+            rows.append(
+                (
+                    wid,
+                    outcome.status,
+                    " | ".join(outcome.issues),
+                    " | ".join(outcome.warnings),
+                    fmt_metric(outcome.fval_abs),
+                    fmt_metric(outcome.edm_abs),
+                    fmt_metric(outcome.max_param_abs),
+                    fmt_metric(outcome.max_error_abs),
+                    fmt_metric(outcome.max_cov_abs),
+                    fmt_metric(outcome.minos_abs),
+                    fmt_metric(outcome.nfcn_rel),
+                )
+            )
 
     csv_path = report_dir / "diff_results.csv"
     report_dir.mkdir(parents=True, exist_ok=True)
     with csv_path.open("w", newline="") as f:
-        writer = csv.DictWriter(
-            f,
-            lineterminator="\n",
-            fieldnames=[
-                "workload",
-                "status",
-                "issues",
-                "warnings",
-                "fval_abs",
-                "edm_abs",
-                "max_param_abs",
-                "max_error_abs",
-                "max_cov_abs",
-                "minos_abs",
-                "nfcn_rel",
-            ],
-        )
-        writer.writeheader()
+        writer = csv.writer(f, lineterminator="\n")
+        writer.writerow(DIFF_FIELDNAMES)
         writer.writerows(rows)
 
     counts = {"pass": 0, "warn": 0, "fail": 0}
     for row in rows:
-        counts[row["status"]] += 1
+        counts[row[1]] += 1
 
     lines = [
         "# Differential Verification Summary",
@@ -291,10 +334,8 @@ def main() -> int:
         "|---|---|---|---|",
     ]
 
-    for row in rows:
-        issues = row["issues"] if row["issues"] else "-"
-        warnings = row["warnings"] if row["warnings"] else "-"
-        lines.append(f"| `{row['workload']}` | `{row['status']}` | {issues} | {warnings} |")
+    for wid, status, issues, warnings, *_ in rows:
+        lines.append(f"| `{wid}` | `{status}` | {issues or '-'} | {warnings or '-'} |")
 
     lines.extend(
         [
@@ -13,15 +13,21 @@ Output:
 from __future__ import annotations
 
 from pathlib import Path
+import mmap
 import re
 
 
+# Bytes pattern (the µ is matched as its UTF-8 encoding) so logs can be scanned
+# straight from a memory map without decoding the whole file first.
 BLOCK_RE = re.compile(
-    r"(?m)^(?P<name>[^\n].+?)\n"
-    r"\s*time:\s+\["
-    r"(?P<low>[0-9.]+)\s*(?P<low_unit>ns|µs|ms|s)\s+"
-    r"(?P<mid>[0-9.]+)\s*(?P<mid_unit>ns|µs|ms|s)\s+"
-    r"(?P<high>[0-9.]+)\s*(?P<high_unit>ns|µs|ms|s)\]\s*$"
+    (
+        r"^(?P<name>[^\n].+?)\n"
+        r"\s*time:\s+\["
+        r"(?P<low>[0-9.]+)\s*(?P<low_unit>ns|µs|ms|s)\s+"
+        r"(?P<mid>[0-9.]+)\s*(?P<mid_unit>ns|µs|ms|s)\s+"
+        r"(?P<high>[0-9.]+)\s*(?P<high_unit>ns|µs|ms|s)\]\s*$"
+    ).encode("utf-8"),
+    re.MULTILINE,
 )
 
 
@@ -37,28 +43,35 @@ def to_us(value: float, unit: str) -> float:
     return value * UNIT_TO_US[unit]
 
 
-def parse_benchmarks(raw: str) -> dict[str, tuple[float, str]]:
+def parse_benchmarks(raw: bytes | mmap.mmap) -> dict[str, tuple[float, str]]:
     out: dict[str, tuple[float, str]] = {}
+    to_us_factor = UNIT_TO_US.__getitem__
     for m in BLOCK_RE.finditer(raw):
-        name = m.group("name").strip()
-        mid = float(m.group("mid"))
-        mid_unit = m.group("mid_unit")
-        out[name] = (to_us(mid, mid_unit), f"{mid:.4g} {mid_unit}")
+        name_b, mid_b, unit_b = m.group("name", "mid", "mid_unit")
+        mid = float(mid_b)
+        mid_unit = unit_b.decode("utf-8")
+        out[name_b.decode("utf-8").strip()] = (mid * to_us_factor(mid_unit), f"{mid:.4g} {mid_unit}")
     return out
 
 
+def parse_benchmarks_file(path: Path) -> dict[str, tuple[float, str]]:
+    if path.stat().st_size == 0:
+        return {}
+    with path.open("rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        return parse_benchmarks(mm)
+
+
 def main() -> None:
     root = Path(__file__).resolve().parents[1]
     bench_dir = root / "reports" / "benchmarks"
     bench_dir.mkdir(parents=True, exist_ok=True)
 
-    default_raw = (bench_dir / "default_raw.txt").read_text()
-    parallel_raw = (bench_dir / "parallel_raw.txt").read_text()
-
-    default = parse_benchmarks(default_raw)
-    parallel = parse_benchmarks(parallel_raw)
+    default = parse_benchmarks_file(bench_dir / "default_raw.txt")
+    parallel = parse_benchmarks_file(bench_dir / "parallel_raw.txt")
 
-    all_names = sorted(set(default) | set(parallel))
+    all_names = sorted(dict.fromkeys((*default, *parallel)))
+    default_get = default.get
+    parallel_get = parallel.get
 
     lines = []
     lines.append("# Benchmark Baseline")
@@ -71,13 +84,15 @@ def main() -> None:
     lines.append("| Benchmark | Default Median | Parallel Median | Parallel vs Default |")
     lines.append("|---|---:|---:|---:|")
     for name in all_names:
-        d = default.get(name)
-        p = parallel.get(name)
+        d = default_get(name)
+        p = parallel_get(name)
         d_txt = d[1] if d else "-"
         p_txt = p[1] if p else "-"
         if d and p:
-            ratio = p[0] / d[0] if d[0] > 0.0 else float("inf")
-            ratio_txt = f"{ratio:.2f}x"
+            try:
+                ratio_txt = f"{p[0] / d[0]:.2f}x"
+            except ZeroDivisionError:
+                ratio_txt = "infx"
         else:
             ratio_txt = "-"
         lines.append(f"| {name} | {d_txt} | {p_txt} | {ratio_txt} |")
@@ -15,17 +15,28 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from pathlib import Path
+from typing import Iterable
+import heapq
+import mmap
+import operator
+import os
 import re
 
 
+# Reference grammar for a summary row. parse_rows uses a str.split fast path;
+# set COVERAGE_ROWS_CROSSCHECK=1 to verify it against this regex.
 ROW_RE = re.compile(
-    r"^(?P<file>\S+)\s+"
-    r"(?P<regions>\d+)\s+(?P<missed_regions>\d+)\s+(?P<regions_cov>[0-9.]+)%\s+"
-    r"(?P<functions>\d+)\s+(?P<missed_functions>\d+)\s+(?P<functions_cov>[0-9.]+)%\s+"
-    r"(?P<lines>\d+)\s+(?P<missed_lines>\d+)\s+(?P<lines_cov>[0-9.]+)%\s+"
-    r"(?P<branches>\d+)\s+(?P<missed_branches>\d+)\s+(?P<branches_cov>[0-9.\-]+%|-)\s*$"
+    rb"^[ \t\r]*(?P<file>\S+)[ \t]+"
+    rb"(?P<regions>\d+)[ \t]+(?P<missed_regions>\d+)[ \t]+(?P<regions_cov>[0-9.]+)%[ \t]+"
+    rb"(?P<functions>\d+)[ \t]+(?P<missed_functions>\d+)[ \t]+(?P<functions_cov>[0-9.]+)%[ \t]+"
+    rb"(?P<lines>\d+)[ \t]+(?P<missed_lines>\d+)[ \t]+(?P<lines_cov>[0-9.]+)%[ \t]+"
+    rb"(?P<branches>\d+)[ \t]+(?P<missed_branches>\d+)[ \t]+(?P<branches_cov>[0-9.\-]+%|-)[ \t\r]*$",
+    re.MULTILINE,
 )
 
+ROW_FIELD_COUNT = 13
+ROW_COUNT_FIELDS = (1, 2, 4, 5, 7, 8, 10, 11)
+
 
 @dataclass
 class CoverageRow:
@@ -35,20 +46,46 @@ class CoverageRow:
     lines_cov: float
 
 
-def parse_rows(raw: str) -> list[CoverageRow]:
-    rows: list[CoverageRow] = []
-    for line in raw.splitlines():
-        m = ROW_RE.match(line.strip())
-        if not m:
-            continue
-        rows.append(
-            CoverageRow(
-                file=m.group("file"),
-                regions_cov=float(m.group("regions_cov")),
-                functions_cov=float(m.group("functions_cov")),
-                lines_cov=float(m.group("lines_cov")),
-            )
+def parse_row(line: bytes) -> CoverageRow | None:
+    parts = line.split()
+    if len(parts) != ROW_FIELD_COUNT:
+        return None
+    if not all(parts[i].isdigit() for i in ROW_COUNT_FIELDS):
+        return None
+    regions_cov, functions_cov, lines_cov, branches_cov = parts[3], parts[6], parts[9], parts[12]
+    if not (regions_cov.endswith(b"%") and functions_cov.endswith(b"%") and lines_cov.endswith(b"%")):
+        return None
+    if branches_cov != b"-" and not branches_cov.endswith(b"%"):
+        return None
+    try:
+        return CoverageRow(
+            file=parts[0].decode("utf-8"),
+            regions_cov=float(regions_cov[:-1]),
+            functions_cov=float(functions_cov[:-1]),
+            lines_cov=float(lines_cov[:-1]),
         )
+    except ValueError:
+        return None
+
+
+def parse_rows(lines: Iterable[bytes]) -> list[CoverageRow]:
+    rows: list[CoverageRow] = []
+    for line in lines:
+        row = parse_row(line)
+        if row is not None:
+            rows.append(row)
+    return rows
+
+
+def parse_rows_file(path: Path) -> list[CoverageRow]:
+    if path.stat().st_size == 0:
+        return []
+    with path.open("rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        rows = parse_rows(iter(mm.readline, b""))
+        if os.environ.get("COVERAGE_ROWS_CROSSCHECK") == "1":
+            expected = [m.group("file").decode("utf-8") for m in ROW_RE.finditer(mm)]
+            if [r.file for r in rows] != expected:
+                raise ValueError(f"split-parsed coverage rows disagree with ROW_RE in {path}")
     return rows
 
 
@@ -61,7 +98,7 @@ def render_report(title: str, command: str, rows: list[CoverageRow]) -> str:
         raise ValueError("TOTAL row missing from coverage log")
 
     module_rows = [r for r in rows if r.file != "TOTAL"]
-    low_rows = sorted(module_rows, key=lambda r: r.lines_cov)[:12]
+    low_rows = heapq.nsmallest(12, module_rows, key=operator.attrgetter("lines_cov"))
 
     lines = []
     lines.append(f"# {title}")
@@ -94,8 +131,8 @@ def main() -> None:
     core_raw_path = coverage_dir / "core_coverage_raw.txt"
     all_raw_path = coverage_dir / "all_features_coverage_raw.txt"
 
-    core_rows = parse_rows(core_raw_path.read_text())
-    all_rows = parse_rows(all_raw_path.read_text())
+    core_rows = parse_rows_file(core_raw_path)
+    all_rows = parse_rows_file(all_raw_path)
 
     core_report = render_report(
         title="Core Coverage Report (`--no-default-features`)",
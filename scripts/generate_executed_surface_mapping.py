@@ -16,13 +16,22 @@ from __future__ import annotations
 
 import argparse
 import csv
+import functools
+import hashlib
+import heapq
+import io
 import json
+import os
+import operator
 import re
 import shutil
 import subprocess
+import sys
+import tempfile
 from collections import Counter, defaultdict
 from dataclasses import dataclass
 from pathlib import Path
+from typing import Iterable, Iterator, NamedTuple
 
 
 REPO_ROOT = Path(__file__).resolve().parents[1]
@@ -33,18 +42,31 @@ DEFAULT_REF_COVERAGE_MANIFEST = REPO_ROOT / "reports" / "verification" / "refere
 DEFAULT_OUT_MD = REPO_ROOT / "reports" / "verification" / "executed_surface_mapping.md"
 DEFAULT_OUT_GAPS_CSV = REPO_ROOT / "reports" / "verification" / "executed_surface_gaps.csv"
 DEFAULT_OUT_MANIFEST = REPO_ROOT / "reports" / "verification" / "executed_surface_manifest.json"
-
-LOW_PRIORITY_WAIVERS = {
-    "intentional",
-    "architectural",
-    "out-of-scope",
-    "upstream-removed",
-    "api-shape-drift",
-}
+DEFAULT_CACHE_DIR = REPO_ROOT / ".cache" / "executed_surface"
+DEFAULT_DEMANGLE_CACHE = REPO_ROOT / ".cache" / "demangle.json"
+
+# Resolved once at import; both demangling and the cache key use it.
+CXXFILT = shutil.which("c++filt")
+
+TEMPLATE_BRACKET_RE = re.compile(r"[<>]")
+PAREN_RE = re.compile(r"[()]")
+SOURCE_SUFFIX_RE = re.compile(r"\.(h|hpp|cxx|cc|cpp)$")
+
+# Operator name up to its parameter list, e.g. `operator+=` or `operator[]`.
+OPERATOR_RE = re.compile(r"operator[^\s(]*")
+
+LOW_PRIORITY_WAIVERS = frozenset(
+    {
+        "intentional",
+        "architectural",
+        "out-of-scope",
+        "upstream-removed",
+        "api-shape-drift",
+    }
+)
 
 
-@dataclass(frozen=True)
-class SymbolInfo:
+class SymbolInfo(NamedTuple):
     symbol: str
     class_name: str
     is_constructor: bool
@@ -52,6 +74,66 @@ class SymbolInfo:
     is_operator: bool
 
 
+class Gap(NamedTuple):
+    """One executed_surface_gaps.csv row; field order is the CSV column order."""
+
+    upstream_file: str
+    upstream_symbol: str
+    function_mangled: str
+    function_demangled: str
+    call_count: str
+    mapping_status: str
+    gap_priority: str
+    waiver_types: str
+    rust_refs: str
+    workload_ids: str
+    notes: str
+
+
+# list.sort evaluates the key once per gap (not per comparison), and the
+# two-character "P0" < "P1" < "P2" order already sorts as plain strings, so no
+# separate priority ordinal is needed.
+GAP_SORT_KEY = operator.attrgetter("gap_priority", "upstream_file", "upstream_symbol", "function_mangled")
+
+
+TraceRow = dict[str, str]
+# Columns actually read from each input, mapped to the value used when a column
+# is absent. Traceability columns are stripped once at ingest so the hot path
+# can compare them as-is; the short categorical/key ones are also interned.
+EXECUTED_COLUMNS = {"function": "", "file": "", "count": "0"}
+TRACE_INTERNED_FIELDS = ("upstream_file", "upstream_symbol", "effective_status", "waiver_type")
+TRACE_STRIPPED_FIELDS = ("rust_file", "rust_symbol", "rationale")
+TRACE_COLUMNS = dict.fromkeys((*TRACE_INTERNED_FIELDS, *TRACE_STRIPPED_FIELDS), "")
+SymbolIndex = dict[str, dict[str, list[TraceRow]]]
+
+
+@dataclass(frozen=True)
+class WaiverRule:
+    raw_status: str
+    rationale_contains: str
+    # Compiled once at load; None when the CSV cell is empty (matches anything).
+    upstream_file_re: re.Pattern[str] | None
+    upstream_symbol_re: re.Pattern[str] | None
+    waiver_type: str
+    reason: str
+
+
+@dataclass(frozen=True)
+class TraceabilityIndex:
+    by_file: dict[str, list[TraceRow]]
+    by_basename: dict[str, list[TraceRow]]
+    # outer key -> normalized upstream symbol (or its lowercase form) -> rows,
+    # so every symbol fallback in main is a lookup rather than a row scan.
+    by_file_sym: SymbolIndex
+    by_file_sym_lower: SymbolIndex
+    by_basename_sym: SymbolIndex
+    by_basename_sym_lower: SymbolIndex
+
+
+def lookup_symbol(index: SymbolIndex, key: str, symbol: str) -> list[TraceRow]:
+    return index.get(key, {}).get(symbol, [])
+
+
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Generate executed-surface mapping and gap report")
     parser.add_argument("--executed-csv", default=str(DEFAULT_EXECUTED_CSV))
@@ -62,24 +144,53 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--out-gaps-csv", default=str(DEFAULT_OUT_GAPS_CSV))
     parser.add_argument("--out-manifest", default=str(DEFAULT_OUT_MANIFEST))
     parser.add_argument("--strict-gate", action="store_true", help="Fail if any P0/P1 unmapped executed gaps remain")
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help=(
+            f"Always recompute instead of reusing outputs cached under {DEFAULT_CACHE_DIR.relative_to(REPO_ROOT)} "
+            f"and demangled names cached in {DEFAULT_DEMANGLE_CACHE.relative_to(REPO_ROOT)}"
+        ),
+    )
     return parser.parse_args()
 
 
-def read_csv(path: Path) -> list[dict[str, str]]:
+def iter_csv_columns(path: Path, columns: dict[str, str]) -> Iterator[tuple[str, ...]]:
+    """Stream the given columns of each row as a tuple, in `columns` order.
+
+    Values missing from the header or from a short row fall back to the
+    default in `columns`. The existence check runs eagerly, before iteration.
+    """
     if not path.exists():
         raise FileNotFoundError(f"missing csv: {path}")
+    return _iter_csv_columns(path, columns)
+
+
+def _iter_csv_columns(path: Path, columns: dict[str, str]) -> Iterator[tuple[str, ...]]:
     with path.open(newline="") as f:
-        return list(csv.DictReader(f))
+        reader = csv.reader(f)
+        header = next(reader, [])
+        # Last occurrence wins on duplicate headers, as with csv.DictReader.
+        positions = {name: i for i, name in enumerate(header)}
+        wanted = [(positions.get(name, -1), default) for name, default in columns.items()]
+        for row in reader:
+            if not row:
+                continue
+            width = len(row)
+            yield tuple(row[i] if 0 <= i < width else default for i, default in wanted)
 
 
+@functools.lru_cache(maxsize=None)
 def normalize_upstream_file(path: str) -> str:
     raw = path.replace("\\", "/").strip()
     marker = "/math/minuit2/"
     if marker in raw:
-        return raw.split(marker, 1)[1]
-    if raw.startswith("math/minuit2/"):
-        return raw[len("math/minuit2/") :]
-    return raw
+        raw = raw.split(marker, 1)[1]
+    elif raw.startswith("math/minuit2/"):
+        raw = raw[len("math/minuit2/") :]
+    # Interned like the traceability index keys, so per-row lookups hit the
+    # identity fast path; memoization makes this once per distinct path.
+    return sys.intern(raw)
 
 
 def extract_mangled_name(raw_function: str) -> str:
@@ -89,46 +200,112 @@ def extract_mangled_name(raw_function: str) -> str:
     return raw_function
 
 
-def demangle_cpp_symbols(symbols: list[str]) -> dict[str, str]:
-    unique = list(dict.fromkeys(symbols))
-    if not unique:
-        return {}
-    cxxfilt = shutil.which("c++filt")
-    if not cxxfilt:
-        return {s: s for s in unique}
-
-    payload = "\n".join(unique) + "\n"
-    proc = subprocess.run(
-        [cxxfilt, "-n"],
-        input=payload,
-        text=True,
-        capture_output=True,
-        check=False,
-    )
-    if proc.returncode != 0:
-        return {s: s for s in unique}
+def dedupe_executed_rows(rows: Iterable[tuple[str, str, str]]) -> list[tuple[str, str, str]]:
+    """Fold repeated (file, mangled name) entries into one, summing call counts.
 
-    demangled = proc.stdout.splitlines()
-    if len(demangled) != len(unique):
-        return {s: s for s in unique}
-    return dict(zip(unique, demangled))
+    First-seen order is kept; a row that occurs once keeps its count text as-is.
+    """
+    out: dict[tuple[str, str], tuple[str, str, str]] = {}
+    for function, executed_file, call_count in rows:
+        key = (executed_file, extract_mangled_name(function.strip()))
+        prev = out.get(key)
+        if prev is None:
+            out[key] = (function, executed_file, call_count)
+        else:
+            out[key] = (prev[0], prev[1], str(int(prev[2] or 0) + int(call_count or 0)))
+    return list(out.values())
 
 
-def strip_templates(text: str) -> str:
-    out = text
-    while True:
-        new = re.sub(r"<[^<>]*>", "", out)
-        if new == out:
+def load_demangle_cache(path: Path) -> dict[str, str]:
+    try:
+        data = json.loads(path.read_text())
+    except (OSError, ValueError):
+        return {}
+    # Entries are only valid for the c++filt that produced them.
+    if not isinstance(data, dict) or data.get("cxxfilt") != CXXFILT:
+        return {}
+    symbols = data.get("symbols")
+    return symbols if isinstance(symbols, dict) else {}
+
+
+def save_demangle_cache(path: Path, symbols: dict[str, str]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile("w", dir=path.parent, suffix=".tmp", delete=False) as f:
+        json.dump({"cxxfilt": CXXFILT, "symbols": symbols}, f, sort_keys=True)
+    os.replace(f.name, path)
+
+
+def demangle_cpp_symbols(symbols: list[str], cache_path: Path | None = None) -> dict[str, str]:
+    out = {s: s for s in symbols}
+    # Only Itanium-mangled names change under c++filt; everything else passes
+    # through as-is, so skip feeding (or spawning) it for those.
+    mangled = [s for s in out if s.startswith("_Z")]
+    if not mangled:
+        return out
+    if not CXXFILT:
+        return out
+
+    known = load_demangle_cache(cache_path) if cache_path else {}
+    pending = [s for s in mangled if s not in known]
+    if pending:
+        payload = "\n".join(pending) + "\n"
+        proc = subprocess.run(
+            [CXXFILT, "-n"],
+            input=payload,
+            text=True,
+            capture_output=True,
+            check=False,
+        )
+        if proc.returncode != 0:
             return out
-        out = new
+
+        demangled = proc.stdout.splitlines()
+        if len(demangled) != len(pending):
+            return out
+        known.update(zip(pending, demangled))
+    # Keep only this input's names, so names from older inputs are pruned
+    # instead of piling up across runs.
+    if cache_path and (pending or len(known) > len(mangled)):
+        save_demangle_cache(cache_path, {s: known[s] for s in mangled})
+    out.update((s, known[s]) for s in mangled)
+    return out
 
 
+@functools.lru_cache(maxsize=None)
+def strip_templates(text: str) -> str:
+    # Single pass: each '>' drops everything back to its matching '<'. Unmatched
+    # brackets (e.g. `operator<`, `operator->`) are kept, as with repeated
+    # innermost `<[^<>]*>` removal. Only bracket positions are visited; the text
+    # between them is copied as slices.
+    if "<" not in text:
+        return text
+    pieces: list[str] = []
+    opens: list[int] = []
+    last = 0
+    for m in TEMPLATE_BRACKET_RE.finditer(text):
+        i = m.start()
+        pieces.append(text[last:i])
+        last = i + 1
+        if text[i] == "<":
+            opens.append(len(pieces))
+            pieces.append("<")
+        elif opens:
+            del pieces[opens.pop() :]
+        else:
+            pieces.append(">")
+    pieces.append(text[last:])
+    return "".join(pieces)
+
+
+# Keyed on scope parts, which repeat across overloads and instantiations even
+# when their full demangled names (the extract_symbol_info key) differ.
+@functools.lru_cache(maxsize=None)
 def canonical_symbol(text: str) -> str:
     out = strip_templates(text).strip().replace(" ", "")
     if out.startswith("operator"):
         if out.startswith("operator()"):
             return "operator()"
-        m = re.match(r"operator[^\s(]*", out)
+        m = OPERATOR_RE.match(out)
         return m.group(0) if m else "operator"
     return out
 
@@ -143,16 +320,17 @@ def extract_function_prefix(demangled: str) -> str:
     if close_idx == -1:
         return text
 
+    # Walk only the parenthesis positions (found by the regex engine) backwards
+    # from the final ")", like strip_templates does for angle brackets.
     depth = 0
     open_idx = -1
-    for i in range(close_idx, -1, -1):
-        ch = text[i]
-        if ch == ")":
+    for m in reversed(list(PAREN_RE.finditer(text, 0, close_idx + 1))):
+        if m.group() == ")":
             depth += 1
-        elif ch == "(":
+        else:
             depth -= 1
             if depth == 0:
-                open_idx = i
+                open_idx = m.start()
                 break
 
     if open_idx == -1:
@@ -189,13 +367,14 @@ def split_cpp_scope(scope: str) -> list[str]:
     return parts
 
 
+@functools.lru_cache(maxsize=None)
 def extract_symbol_info(demangled: str) -> SymbolInfo:
     signature_prefix = extract_function_prefix(demangled)
     parts = split_cpp_scope(signature_prefix)
     if not parts:
         return SymbolInfo(symbol=demangled, class_name="", is_constructor=False, is_destructor=False, is_operator=False)
 
-    symbol = canonical_symbol(parts[-1])
+    symbol = sys.intern(canonical_symbol(parts[-1]))
     class_name = canonical_symbol(parts[-2]) if len(parts) >= 2 else ""
     is_operator = symbol.startswith("operator")
     is_constructor = bool(class_name) and symbol == class_name
@@ -209,40 +388,65 @@ def extract_symbol_info(demangled: str) -> SymbolInfo:
     )
 
 
+@functools.lru_cache(maxsize=None)
 def upstream_basename(path: str) -> str:
     if not path:
         return ""
     part = path.replace("\\", "/").strip().split("/")[-1]
-    return re.sub(r"\.(h|hpp|cxx|cc|cpp)$", "", part)
-
-
-def index_traceability(
-    rows: list[dict[str, str]]
-) -> tuple[
-    dict[tuple[str, str], list[dict[str, str]]],
-    dict[str, list[dict[str, str]]],
-    dict[str, list[dict[str, str]]],
-]:
-    by_key: dict[tuple[str, str], list[dict[str, str]]] = defaultdict(list)
-    by_file: dict[str, list[dict[str, str]]] = defaultdict(list)
-    by_basename: dict[str, list[dict[str, str]]] = defaultdict(list)
+    return SOURCE_SUFFIX_RE.sub("", part)
+
+
+def normalize_trace_row(values: tuple[str, ...]) -> TraceRow:
+    """Build a matching row from a `TRACE_COLUMNS` tuple."""
+    row = dict(zip(TRACE_COLUMNS, map(str.strip, values)))
+    for key in TRACE_INTERNED_FIELDS:
+        row[key] = sys.intern(row[key])
+    return row
+
+
+def index_traceability(rows: Iterable[TraceRow]) -> TraceabilityIndex:
+    """Index rows already passed through `normalize_trace_row`."""
+    def symbol_index() -> SymbolIndex:
+        return defaultdict(lambda: defaultdict(list))
+
+    by_file: dict[str, list[TraceRow]] = defaultdict(list)
+    by_basename: dict[str, list[TraceRow]] = defaultdict(list)
+    # file -> symbol -> rows: lookups hash two interned strings instead of
+    # building and hashing a (file, symbol) tuple per executed row.
+    by_file_sym = symbol_index()
+    by_file_sym_lower = symbol_index()
+    by_basename_sym = symbol_index()
+    by_basename_sym_lower = symbol_index()
     for row in rows:
-        upstream_file = row.get("upstream_file", "").strip()
-        upstream_files = [p.strip() for p in upstream_file.split(";") if p.strip()] or [upstream_file]
-        upstream_symbol = row.get("upstream_symbol", "").strip().replace(" ", "")
+        upstream_file = row["upstream_file"]
+        # Keyed like the executed side, so `math/minuit2/...` or Windows-style
+        # paths in the matrix hit the direct lookup instead of the basename fallback.
+        upstream_files = [normalize_upstream_file(p) for p in upstream_file.split(";") if p.strip()] or [upstream_file]
+        upstream_symbol = sys.intern(row["upstream_symbol"].replace(" ", ""))
+        upstream_symbol_lower = sys.intern(upstream_symbol.lower())
         for upstream_path in upstream_files:
-            by_key[(upstream_path, upstream_symbol)].append(row)
             by_file[upstream_path].append(row)
+            by_file_sym[upstream_path][upstream_symbol].append(row)
+            by_file_sym_lower[upstream_path][upstream_symbol_lower].append(row)
             base = upstream_basename(upstream_path)
             if base:
                 by_basename[base].append(row)
-    return by_key, by_file, by_basename
+                by_basename_sym[base][upstream_symbol].append(row)
+                by_basename_sym_lower[base][upstream_symbol_lower].append(row)
+    return TraceabilityIndex(
+        by_file=by_file,
+        by_basename=by_basename,
+        by_file_sym=by_file_sym,
+        by_file_sym_lower=by_file_sym_lower,
+        by_basename_sym=by_basename_sym,
+        by_basename_sym_lower=by_basename_sym_lower,
+    )
 
 
-def read_waiver_rules(path: Path) -> list[dict[str, str]]:
+def read_waiver_rules(path: Path) -> list[WaiverRule]:
     if not path.exists():
         return []
-    out: list[dict[str, str]] = []
+    out: list[WaiverRule] = []
     with path.open(newline="") as f:
         reader = csv.DictReader(f)
         required = {
@@ -257,39 +461,56 @@ def read_waiver_rules(path: Path) -> list[dict[str, str]]:
         if missing:
             raise ValueError(f"waiver rules file missing columns: {sorted(missing)}")
         for row in reader:
-            out.append({k: (row.get(k, "") or "").strip() for k in required})
+            rule = {k: (row.get(k, "") or "").strip() for k in required}
+            file_re = rule["upstream_file_regex"]
+            symbol_re = rule["upstream_symbol_regex"]
+            out.append(
+                WaiverRule(
+                    raw_status=rule["raw_status"],
+                    rationale_contains=rule["rationale_contains"],
+                    upstream_file_re=re.compile(file_re) if file_re else None,
+                    upstream_symbol_re=re.compile(symbol_re) if symbol_re else None,
+                    waiver_type=rule["waiver_type"],
+                    reason=rule["reason"],
+                )
+            )
     return out
 
 
 def find_unmatched_waiver_rule(
-    rules: list[dict[str, str]],
+    rules: list[WaiverRule],
     upstream_file: str,
     upstream_symbol: str,
-) -> dict[str, str] | None:
+) -> WaiverRule | None:
     for rule in rules:
         # Unmatched executed-surface gaps do not have a raw parity status/rationale context.
         # Only dedicated file/symbol rules (with empty raw_status/rationale_contains) apply here.
-        if rule.get("raw_status", ""):
+        if rule.raw_status:
             continue
-        if rule.get("rationale_contains", ""):
+        if rule.rationale_contains:
             continue
-        file_re = rule.get("upstream_file_regex", "")
-        symbol_re = rule.get("upstream_symbol_regex", "")
-        if file_re and not re.search(file_re, upstream_file):
+        if rule.upstream_file_re and not rule.upstream_file_re.search(upstream_file):
             continue
-        if symbol_re and not re.search(symbol_re, upstream_symbol):
+        if rule.upstream_symbol_re and not rule.upstream_symbol_re.search(upstream_symbol):
             continue
         return rule
     return None
 
 
 def rank_status(rows: list[dict[str, str]]) -> str:
-    statuses = [r.get("effective_status", "").strip() for r in rows]
-    if "implemented" in statuses:
-        return "implemented"
-    if "unresolved" in statuses:
+    # Single pass: `implemented` wins outright, otherwise remember what was seen.
+    seen_unresolved = seen_waived = False
+    for r in rows:
+        status = r["effective_status"]
+        if status == "implemented":
+            return "implemented"
+        if status == "unresolved":
+            seen_unresolved = True
+        elif status == "waived":
+            seen_waived = True
+    if seen_unresolved:
         return "unresolved"
-    if "waived" in statuses:
+    if seen_waived:
         return "waived"
     return "missing"
 
@@ -298,9 +519,9 @@ def file_is_low_priority_waived(file_rows: list[dict[str, str]]) -> bool:
     if not file_rows:
         return False
     for row in file_rows:
-        if row.get("effective_status", "").strip() != "waived":
+        if row["effective_status"] != "waived":
             return False
-        waiver_type = row.get("waiver_type", "").strip()
+        waiver_type = row["waiver_type"]
         if waiver_type and waiver_type not in LOW_PRIORITY_WAIVERS:
             return False
     return True
@@ -321,14 +542,36 @@ def classify_gap_priority(
             return "P2"
         return "P1"
 
-    waiver_types = {r.get("waiver_type", "").strip() for r in matched_rows if r.get("waiver_type", "").strip()}
-    if not waiver_types:
-        return "P1"
-    if waiver_types <= LOW_PRIORITY_WAIVERS:
-        return "P2"
-    if "tooling" in waiver_types:
-        return "P1"
-    return "P1"
+    # P2 only if at least one waiver type is present and all are low priority;
+    # the first other type (including "tooling") settles it as P1.
+    saw_waiver_type = False
+    for r in matched_rows:
+        waiver_type = r["waiver_type"]
+        if not waiver_type:
+            continue
+        if waiver_type not in LOW_PRIORITY_WAIVERS:
+            return "P1"
+        saw_waiver_type = True
+    return "P2" if saw_waiver_type else "P1"
+
+
+def join_match_fields(matches: list[TraceRow]) -> tuple[str, str, str]:
+    """Return the joined waiver_types, rust_refs and notes cells for a gap."""
+    waiver_types: set[str] = set()
+    rust_refs: set[str] = set()
+    rationale: set[str] = set()
+    for r in matches:
+        waiver_type = r["waiver_type"]
+        if waiver_type:
+            waiver_types.add(waiver_type)
+        rust_file = r["rust_file"]
+        rust_symbol = r["rust_symbol"]
+        if rust_file and rust_symbol:
+            rust_refs.add(f"{rust_file}::{rust_symbol}")
+        note = r["rationale"]
+        if note:
+            rationale.add(note)
+    return ";".join(sorted(waiver_types)), ";".join(sorted(rust_refs)), " | ".join(sorted(rationale))
 
 
 def load_workloads_from_reference_manifest(path: Path) -> list[str]:
@@ -341,72 +584,140 @@ def load_workloads_from_reference_manifest(path: Path) -> list[str]:
     return []
 
 
+def cache_key(args: argparse.Namespace) -> str:
+    """SHA-256 over everything the outputs depend on: this script, its inputs,
+    the output paths (recorded in the manifest) and the c++filt in use."""
+    h = hashlib.sha256()
+    h.update(Path(__file__).read_bytes())
+    for name in (args.executed_csv, args.traceability_csv, args.waiver_rules_csv, args.reference_manifest):
+        path = Path(name)
+        h.update(f"\0{path}\0".encode())
+        h.update(b"1" + path.read_bytes() if path.exists() else b"0")
+    for name in (args.out_md, args.out_gaps_csv, args.out_manifest, CXXFILT or ""):
+        h.update(f"\0{name}".encode())
+    return h.hexdigest()
+
+
+def store_cached_outputs(cache_dir: Path, outputs: tuple[Path, ...]) -> None:
+    # Copy into a scratch dir and rename it into place, so an interrupted run
+    # never leaves a partial entry that a later run would trust.
+    cache_dir.parent.mkdir(parents=True, exist_ok=True)
+    scratch = Path(tempfile.mkdtemp(dir=cache_dir.parent))
+    for i, path in enumerate(outputs):
+        shutil.copyfile(path, scratch / str(i))
+    try:
+        scratch.rename(cache_dir)
+    except OSError:
+        shutil.rmtree(scratch, ignore_errors=True)
+        return
+    # Only the latest entry is kept; entries for older inputs would never be
+    # hit again and would otherwise pile up one directory per input change.
+    for stale in cache_dir.parent.iterdir():
+        if stale != cache_dir:
+            shutil.rmtree(stale, ignore_errors=True)
+
+
+def restore_cached_outputs(cache_dir: Path, outputs: tuple[Path, ...]) -> bool:
+    if not cache_dir.is_dir():
+        return False
+    for i, path in enumerate(outputs):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(cache_dir / str(i), path)
+    return True
+
+
+def report_outputs(outputs: tuple[Path, ...], priority_counts: dict[str, int], gate_pass: bool) -> None:
+    for path in outputs:
+        print(f"Wrote {path.relative_to(REPO_ROOT)}")
+    print(
+        "Gate status: "
+        f"P0={priority_counts['P0']} P1={priority_counts['P1']} "
+        f"P2={priority_counts['P2']} pass={gate_pass}"
+    )
+
+
 def main() -> int:
     args = parse_args()
-
-    executed_rows = read_csv(Path(args.executed_csv))
-    traceability_rows = read_csv(Path(args.traceability_csv))
+    out_md = Path(args.out_md)
+    out_gaps = Path(args.out_gaps_csv)
+    out_manifest = Path(args.out_manifest)
+    outputs = (out_md, out_gaps, out_manifest)
+
+    cache_dir = None if args.no_cache else DEFAULT_CACHE_DIR / cache_key(args)
+    if cache_dir is not None and restore_cached_outputs(cache_dir, outputs):
+        manifest = json.loads(out_manifest.read_text())
+        gate_pass = bool(manifest["gate"]["pass"])
+        report_outputs(outputs, manifest["priority_counts"], gate_pass)
+        return 1 if args.strict_gate and not gate_pass else 0
+
+    # (function, file, count) tuples, one per distinct function; both passes below walk this list.
+    executed_rows = dedupe_executed_rows(iter_csv_columns(Path(args.executed_csv), EXECUTED_COLUMNS))
+    traceability_rows = map(normalize_trace_row, iter_csv_columns(Path(args.traceability_csv), TRACE_COLUMNS))
     waiver_rules = read_waiver_rules(Path(args.waiver_rules_csv))
-    trace_by_key, trace_by_file, trace_by_basename = index_traceability(traceability_rows)
+    trace = index_traceability(traceability_rows)
     workload_ids = load_workloads_from_reference_manifest(Path(args.reference_manifest))
 
-    mangled_names = [extract_mangled_name(row.get("function", "")) for row in executed_rows]
-    demangled_map = demangle_cpp_symbols(mangled_names)
+    mangled_names = [extract_mangled_name(function) for function, _, _ in executed_rows]
+    demangled_map = demangle_cpp_symbols(mangled_names, None if args.no_cache else DEFAULT_DEMANGLE_CACHE)
 
-    gaps: list[dict[str, str]] = []
+    gaps: list[Gap] = []
     mapped_count = 0
-    priority_counts = Counter()
-    file_gap_counts: dict[str, int] = defaultdict(int)
-
-    for row in executed_rows:
-        raw_function = row.get("function", "").strip()
+    workload_ids_txt = ";".join(workload_ids)
+    joined_fields: dict[int, tuple[list[TraceRow], str, str, str]] = {}
+    file_waived: dict[int, tuple[list[TraceRow], bool]] = {}
+
+    # Kept serial on purpose: every per-row step is an index lookup or a cached
+    # parse, so the loop costs milliseconds even for large coverage dumps, and a
+    # process pool would spend more on start-up and pickling the indexes.
+    for function, executed_file, call_count in executed_rows:
+        raw_function = function.strip()
         mangled = extract_mangled_name(raw_function)
         demangled = demangled_map.get(mangled, mangled)
         info = extract_symbol_info(demangled)
 
-        upstream_file = normalize_upstream_file(row.get("file", ""))
+        upstream_file = normalize_upstream_file(executed_file)
         file_basename = upstream_basename(upstream_file)
-        file_rows = trace_by_file.get(upstream_file, [])
-        if not file_rows:
-            file_rows = trace_by_basename.get(file_basename, [])
-        key = (upstream_file, info.symbol)
-        matches = trace_by_key.get(key, [])
+        file_rows = trace.by_file.get(upstream_file, [])
+        base_rows = trace.by_basename.get(file_basename, [])
+        matches: list[TraceRow] = []
+        # A file known neither by path nor by basename cannot match any row, so
+        # skip the lookup chain and go straight to the waiver-rule fallback.
+        if file_rows or base_rows:
+            symbol_lower = info.symbol.lower()
+            if file_rows:
+                file_sym_lower = trace.by_file_sym_lower.get(upstream_file, {})
+            else:
+                file_rows = base_rows
+                file_sym_lower = trace.by_basename_sym_lower.get(file_basename, {})
+            matches = lookup_symbol(trace.by_file_sym, upstream_file, info.symbol)
 
-        if not matches:
-            key_lower = (upstream_file, info.symbol.lower())
-            matches = [
-                r
-                for r in file_rows
-                if r.get("upstream_symbol", "").strip().replace(" ", "").lower() == key_lower[1]
-            ]
-        if not matches:
-            base_rows = trace_by_basename.get(file_basename, [])
-            matches = [
-                r
-                for r in base_rows
-                if r.get("upstream_symbol", "").strip().replace(" ", "") == info.symbol
-            ]
             if not matches:
-                matches = [
-                    r
-                    for r in base_rows
-                    if r.get("upstream_symbol", "").strip().replace(" ", "").lower() == info.symbol.lower()
-                ]
-            if matches:
-                file_rows = base_rows
+                matches = file_sym_lower.get(symbol_lower, [])
+            if not matches:
+                matches = lookup_symbol(trace.by_basename_sym, file_basename, info.symbol)
+                if not matches:
+                    matches = lookup_symbol(trace.by_basename_sym_lower, file_basename, symbol_lower)
+                if matches:
+                    file_rows = base_rows
 
         # For files that are fully waived for low-priority architectural/intentional reasons
         # (e.g. MnPrint), treat unmatched instantiations as waived at file level.
-        if not matches and file_is_low_priority_waived(file_rows):
-            matches = file_rows
+        if not matches and file_rows:
+            # Evaluated once per index list (many executed rows share a file);
+            # keeping `file_rows` in the entry pins its id like `joined_fields`.
+            waived = file_waived.get(id(file_rows))
+            if waived is None:
+                waived = file_waived[id(file_rows)] = (file_rows, file_is_low_priority_waived(file_rows))
+            if waived[1]:
+                matches = file_rows
         if not matches:
             rule = find_unmatched_waiver_rule(waiver_rules, upstream_file, info.symbol)
             if rule:
                 matches = [
                     {
                         "effective_status": "waived",
-                        "waiver_type": rule.get("waiver_type", ""),
-                        "rationale": rule.get("reason", ""),
+                        "waiver_type": rule.waiver_type,
+                        "rationale": rule.reason,
                         "rust_file": "",
                         "rust_symbol": "",
                     }
@@ -418,66 +729,46 @@ def main() -> int:
             continue
 
         priority = classify_gap_priority(mapping_status, info, matches, file_rows)
-        if priority:
-            priority_counts[priority] += 1
-            file_gap_counts[upstream_file] += 1
 
-        waiver_types = sorted(
-            {r.get("waiver_type", "").strip() for r in matches if r.get("waiver_type", "").strip()}
-        )
-        rust_refs = sorted(
-            {
-                f"{r.get('rust_file', '').strip()}::{r.get('rust_symbol', '').strip()}"
-                for r in matches
-                if r.get("rust_file", "").strip() and r.get("rust_symbol", "").strip()
-            }
-        )
-        rationale = sorted(
-            {r.get("rationale", "").strip() for r in matches if r.get("rationale", "").strip()}
-        )
+        # Index lists are shared by every executed row that resolves to the same
+        # (file, symbol); the cached entry keeps `matches` alive so its id stays unique.
+        cached = joined_fields.get(id(matches))
+        if cached is None:
+            cached = joined_fields[id(matches)] = (matches, *join_match_fields(matches))
+        _, waiver_types_txt, rust_refs_txt, notes_txt = cached
 
         gaps.append(
-            {
-                "upstream_file": upstream_file,
-                "upstream_symbol": info.symbol,
-                "function_mangled": mangled,
-                "function_demangled": demangled,
-                "call_count": row.get("count", "0"),
-                "mapping_status": mapping_status,
-                "gap_priority": priority or "P2",
-                "waiver_types": ";".join(waiver_types),
-                "rust_refs": ";".join(rust_refs),
-                "workload_ids": ";".join(workload_ids),
-                "notes": " | ".join(rationale),
-            }
+            Gap(
+                upstream_file=upstream_file,
+                upstream_symbol=info.symbol,
+                function_mangled=mangled,
+                function_demangled=demangled,
+                call_count=call_count,
+                mapping_status=mapping_status,
+                gap_priority=priority or "P2",
+                waiver_types=waiver_types_txt,
+                rust_refs=rust_refs_txt,
+                workload_ids=workload_ids_txt,
+                notes=notes_txt,
+            )
         )
 
-    gaps.sort(key=lambda r: (r["gap_priority"], r["upstream_file"], r["upstream_symbol"], r["function_mangled"]))
+    gaps.sort(key=GAP_SORT_KEY)
 
-    out_gaps = Path(args.out_gaps_csv)
     out_gaps.parent.mkdir(parents=True, exist_ok=True)
-    with out_gaps.open("w", newline="") as f:
-        fieldnames = [
-            "upstream_file",
-            "upstream_symbol",
-            "function_mangled",
-            "function_demangled",
-            "call_count",
-            "mapping_status",
-            "gap_priority",
-            "waiver_types",
-            "rust_refs",
-            "workload_ids",
-            "notes",
-        ]
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
+    with out_gaps.open("w", newline="", buffering=1 << 20) as f:
+        writer = csv.writer(f)
+        writer.writerow(Gap._fields)
         writer.writerows(gaps)
 
+    # classify_gap_priority only returns "" for implemented rows, which never reach
+    # `gaps`, so both tallies can be taken in one C-level pass after the loop.
+    priority_counts = Counter(gap.gap_priority for gap in gaps)
+    file_gap_counts = Counter(gap.upstream_file for gap in gaps)
     total_executed = len(executed_rows)
     unmapped = len(gaps)
     gate_pass = priority_counts["P0"] == 0 and priority_counts["P1"] == 0
-    top_gap_files = sorted(file_gap_counts.items(), key=lambda x: (-x[1], x[0]))[:15]
+    top_gap_files = heapq.nsmallest(15, file_gap_counts.items(), key=lambda x: (-x[1], x[0]))
 
     manifest = {
         "executed_functions_total": total_executed,
@@ -494,76 +785,67 @@ def main() -> int:
         },
         "workloads": workload_ids,
         "artifacts": {
-            "mapping_md": str(Path(args.out_md)),
+            "mapping_md": str(out_md),
             "gaps_csv": str(out_gaps),
         },
     }
 
-    out_manifest = Path(args.out_manifest)
     out_manifest.write_text(json.dumps(manifest, indent=2) + "\n")
 
-    lines: list[str] = []
-    lines.append("# Executed Surface Mapping")
-    lines.append("")
-    lines.append("Join of reference executed C++ functions with traceability matrix mappings.")
-    lines.append("")
-    lines.append("## Summary")
-    lines.append("")
-    lines.append(f"- Executed C++ functions: **{total_executed}**")
-    lines.append(f"- Mapped to implemented Rust symbols: **{mapped_count}**")
-    lines.append(f"- Unmapped executed functions: **{unmapped}**")
-    lines.append(
+    buf = io.StringIO()
+    w = buf.write
+    # Fixed-shape blocks are single (implicitly concatenated) writes; only the
+    # optional workloads line and the per-row tables below are written piecemeal.
+    w(
+        "# Executed Surface Mapping\n\n"
+        "Join of reference executed C++ functions with traceability matrix mappings.\n\n"
+        "## Summary\n\n"
+        f"- Executed C++ functions: **{total_executed}**\n"
+        f"- Mapped to implemented Rust symbols: **{mapped_count}**\n"
+        f"- Unmapped executed functions: **{unmapped}**\n"
         f"- Unmapped priority split: P0={priority_counts['P0']}, "
-        f"P1={priority_counts['P1']}, P2={priority_counts['P2']}"
+        f"P1={priority_counts['P1']}, P2={priority_counts['P2']}\n"
+        f"- Gate (`P0 == 0 and P1 == 0`): **{'PASS' if gate_pass else 'FAIL'}**\n"
     )
-    lines.append(f"- Gate (`P0 == 0 and P1 == 0`): **{'PASS' if gate_pass else 'FAIL'}**")
     if workload_ids:
-        lines.append(f"- Coverage workloads used: **{len(workload_ids)}**")
-    lines.append("")
-    lines.append("## Artifacts")
-    lines.append("")
-    lines.append("- `reports/verification/executed_surface_mapping.md`")
-    lines.append("- `reports/verification/executed_surface_gaps.csv`")
-    lines.append("- `reports/verification/executed_surface_manifest.json`")
-    lines.append("")
-    lines.append("## Top Gap Files")
-    lines.append("")
+        w(f"- Coverage workloads used: **{len(workload_ids)}**\n")
+    w(
+        "\n## Artifacts\n\n"
+        "- `reports/verification/executed_surface_mapping.md`\n"
+        "- `reports/verification/executed_surface_gaps.csv`\n"
+        "- `reports/verification/executed_surface_manifest.json`\n"
+        "\n## Top Gap Files\n\n"
+    )
     if top_gap_files:
         for upstream_file, count in top_gap_files:
-            lines.append(f"- `{upstream_file}`: {count}")
+            w(f"- `{upstream_file}`: {count}\n")
     else:
-        lines.append("- none")
-    lines.append("")
-    lines.append("## Top P0/P1 Gaps")
-    lines.append("")
-    lines.append("| Priority | Upstream file | Symbol | Mapping status | Call count |")
-    lines.append("|---|---|---|---|---|")
+        w("- none\n")
+    w("\n## Top P0/P1 Gaps\n\n")
+    w("| Priority | Upstream file | Symbol | Mapping status | Call count |\n")
+    w("|---|---|---|---|---|\n")
+    # `gaps` is already sorted by priority for the CSV, so P0/P1 rows lead and
+    # the first P2 row ends the table.
     shown = 0
     for gap in gaps:
-        if gap["gap_priority"] not in {"P0", "P1"}:
-            continue
-        lines.append(
-            f"| {gap['gap_priority']} | `{gap['upstream_file']}` | `{gap['upstream_symbol']}` | "
-            f"`{gap['mapping_status']}` | {gap['call_count']} |"
+        if gap.gap_priority not in {"P0", "P1"}:
+            break
+        w(
+            f"| {gap.gap_priority} | `{gap.upstream_file}` | `{gap.upstream_symbol}` | "
+            f"`{gap.mapping_status}` | {gap.call_count} |\n"
         )
         shown += 1
         if shown >= 40:
             break
     if shown == 0:
-        lines.append("| - | - | - | - | - |")
-    lines.append("")
+        w("| - | - | - | - | - |\n")
+    w("\n")
 
-    out_md = Path(args.out_md)
-    out_md.write_text("\n".join(lines) + "\n")
+    out_md.write_text(buf.getvalue())
 
-    print(f"Wrote {out_md.relative_to(REPO_ROOT)}")
-    print(f"Wrote {out_gaps.relative_to(REPO_ROOT)}")
-    print(f"Wrote {out_manifest.relative_to(REPO_ROOT)}")
-    print(
-        "Gate status: "
-        f"P0={priority_counts['P0']} P1={priority_counts['P1']} "
-        f"P2={priority_counts['P2']} pass={gate_pass}"
-    )
+    if cache_dir is not None:
+        store_cached_outputs(cache_dir, outputs)
+    report_outputs(outputs, priority_counts, gate_pass)
 
     if args.strict_gate and not gate_pass:
         return 1
@@ -20,15 +20,26 @@ from __future__ import annotations
 
 import csv
 import argparse
+import base64
+import functools
+import heapq
+import http.client
+import os
 import re
+import shutil
 import subprocess
 import sys
 import textwrap
+import threading
 import urllib.error
+import urllib.parse
 import urllib.request
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
 from dataclasses import dataclass
 from pathlib import Path
+from typing import Iterator
 
 
 REPO_ROOT = Path(__file__).resolve().parents[1]
@@ -40,6 +51,9 @@ DEFAULT_UPSTREAM_REPO = "root-project/root"
 DEFAULT_UPSTREAM_SUBDIR = "math/minuit2"
 DEFAULT_UPSTREAM_TAG = "v6-36-08"
 IN_SCOPE_INVENTORY_ACTIONS = {"implement", "port"}
+RAW_HOST = "raw.githubusercontent.com"
+REDIRECT_STATUSES = frozenset({301, 302, 303, 307, 308})
+MAX_REDIRECTS = 5
 
 
 CPP_KEYWORDS = {
@@ -190,6 +204,37 @@ SYMBOL_ALIASES: dict[str, dict[str, list[str]]] = {
 }
 
 
+# Column order shared by functions.csv, missing.csv and needs_review.csv.
+FUNCTION_FIELDS = (
+    "upstream_repo",
+    "upstream_subdir",
+    "upstream_ref",
+    "upstream_commit",
+    "upstream_file",
+    "upstream_symbol",
+    "upstream_line",
+    "rust_file",
+    "rust_symbol",
+    "rust_line",
+    "status",
+    "rationale",
+)
+
+# Fixed "Notes" section of gaps.md.
+GAPS_NOTES_LINES = tuple(
+    textwrap.dedent(
+        """
+        - Symbol extraction is heuristic (regex-based), not a full C++ parser.
+        - `intentionally-skipped` currently captures constructor/destructor/operator-style symbols that map to Rust idioms.
+        - `needs-review` includes architectural refactors where strict 1:1 symbol naming is not expected.
+        - Use `reports/parity/functions.csv` as the source of truth for triage and manual confirmation.
+        """
+    )
+    .strip()
+    .splitlines()
+)
+
+
 @dataclass(frozen=True)
 class UpstreamFile:
     path: str
@@ -240,6 +285,10 @@ def resolve_git_ref(repo_slug: str, ref: str) -> str:
     raise RuntimeError(f"unable to resolve ref '{ref}' in {repo_slug}")
 
 
+MARKDOWN_LINK_TEXT_RE = re.compile(r"\[([^\]]+)\]")
+SOURCE_SUFFIX_RE = re.compile(r"\.(h|hpp|cxx|cpp|cc)$")
+
+
 def parse_inventory_port_files() -> list[UpstreamFile]:
     text = INVENTORY_PATH.read_text()
     files: list[UpstreamFile] = []
@@ -260,42 +309,161 @@ def parse_inventory_port_files() -> list[UpstreamFile]:
         if action not in IN_SCOPE_INVENTORY_ACTIONS:
             continue
 
-        m = re.search(r"\[([^\]]+)\]", cells[0])
+        m = MARKDOWN_LINK_TEXT_RE.search(cells[0])
         if not m:
             continue
         rel = m.group(1).strip()
-        if not (rel.startswith("inc/") or rel.startswith("src/")):
+        if not rel.startswith(("inc/", "src/")):
             continue
-        basename = re.sub(r"\.(h|hpp|cxx|cpp|cc)$", "", rel.split("/")[-1])
+        basename = SOURCE_SUFFIX_RE.sub("", rel.rpartition("/")[2])
         files.append(UpstreamFile(path=rel, basename=basename))
     # keep insertion order, drop exact duplicates
-    unique: dict[tuple[str, str], UpstreamFile] = {}
-    for f in files:
-        unique[(f.path, f.basename)] = f
-    return list(unique.values())
+    return list(dict.fromkeys(files))
+
+
+# One keep-alive connection per download thread, so TLS is negotiated once per
+# worker instead of once per file.
+_RAW_CONNECTIONS = threading.local()
+
+
+def raw_connection(fresh: bool = False) -> http.client.HTTPSConnection:
+    conn = getattr(_RAW_CONNECTIONS, "conn", None)
+    if conn is None or fresh:
+        if conn is not None:
+            conn.close()
+        conn = _RAW_CONNECTIONS.conn = new_raw_connection()
+    return conn
+
+
+def new_raw_connection() -> http.client.HTTPSConnection:
+    # Honour https_proxy/no_proxy the way urllib.request.urlopen would, by
+    # CONNECT-tunnelling through the proxy to the raw host.
+    proxy_url = urllib.request.getproxies().get("https")
+    if not proxy_url or urllib.request.proxy_bypass(RAW_HOST):
+        return http.client.HTTPSConnection(RAW_HOST)
+    proxy = urllib.parse.urlsplit(proxy_url if "://" in proxy_url else f"http://{proxy_url}")
+    conn = http.client.HTTPSConnection(proxy.hostname, proxy.port or (443 if proxy.scheme == "https" else 80))
+    headers = {}
+    if proxy.username is not None:
+        credentials = f"{urllib.parse.unquote(proxy.username)}:{urllib.parse.unquote(proxy.password or '')}"
+        headers["Proxy-Authorization"] = "Basic " + base64.b64encode(credentials.encode()).decode("ascii")
+    conn.set_tunnel(RAW_HOST, headers=headers)
+    return conn
+
+
+def drop_raw_connection() -> None:
+    conn = getattr(_RAW_CONNECTIONS, "conn", None)
+    if conn is not None:
+        conn.close()
+        _RAW_CONNECTIONS.conn = None
+
+
+def upstream_cache_dir(repo_slug: str, subdir: str) -> Path:
+    return CACHE_DIR / repo_slug.replace("/", "__") / subdir.replace("/", "__")
+
+
+def get_raw(url_path: str, url: str) -> http.client.HTTPResponse:
+    # A reused connection may have been closed by the server while idle; retry
+    # once on a fresh one. (A `Connection: close` reply just reconnects lazily.)
+    for attempt in range(2):
+        conn = raw_connection(fresh=attempt > 0)
+        try:
+            conn.request("GET", url_path)  # nosec - fixed github raw host
+            return conn.getresponse()
+        except (http.client.HTTPException, OSError) as e:
+            if attempt:
+                drop_raw_connection()
+                raise RuntimeError(f"failed to download {url}: {e}") from e
+    raise AssertionError("unreachable")
 
 
 def download_upstream_file(repo_slug: str, subdir: str, commit: str, rel_path: str) -> Path:
-    cache_path = CACHE_DIR / repo_slug.replace("/", "__") / subdir.replace("/", "__") / commit / rel_path
+    cache_path = upstream_cache_dir(repo_slug, subdir) / commit / rel_path
     if cache_path.exists():
         return cache_path
     cache_path.parent.mkdir(parents=True, exist_ok=True)
     prefix = subdir.strip("/")
     full_path = f"{prefix}/{rel_path}" if prefix else rel_path
-    url = f"https://raw.githubusercontent.com/{repo_slug}/{commit}/{full_path}"
+    url_path = f"/{repo_slug}/{commit}/{full_path}"
+    url = f"https://{RAW_HOST}{url_path}"
+    resp = get_raw(url_path, url)
+    # Follow redirects the way urlopen did: on the keep-alive connection while
+    # they stay on the raw host, through urlopen once they leave it.
+    for _ in range(MAX_REDIRECTS):
+        location = resp.getheader("Location")
+        if resp.status not in REDIRECT_STATUSES or not location:
+            break
+        resp.read()
+        target = urllib.parse.urlsplit(urllib.parse.urljoin(f"https://{RAW_HOST}{url_path}", location))
+        if target.scheme == "https" and target.netloc == RAW_HOST:
+            url_path = target.path + (f"?{target.query}" if target.query else "")
+            resp = get_raw(url_path, url)
+            continue
+        try:
+            resp = urllib.request.urlopen(target.geturl())  # nosec - redirect from the fixed github raw host
+        except urllib.error.HTTPError as e:
+            raise RuntimeError(f"failed to download {url}: {e.code}") from e
+        except OSError as e:
+            raise RuntimeError(f"failed to download {url}: {e}") from e
+        break
+    if resp.status != 200:
+        resp.read()  # drain so the connection stays reusable
+        raise RuntimeError(f"failed to download {url}: {resp.status}")
+    # Stream to a side file and rename, so an interrupted fetch never leaves a
+    # truncated file that the cache check above would trust.
+    part_path = cache_path.with_name(cache_path.name + ".part")
     try:
-        with urllib.request.urlopen(url) as r:  # nosec - fixed github raw host
-            data = r.read()
-    except urllib.error.HTTPError as e:
-        raise RuntimeError(f"failed to download {url}: {e.code}") from e
-    cache_path.write_bytes(data)
+        with part_path.open("wb") as f:
+            shutil.copyfileobj(resp, f)
+    except (http.client.HTTPException, OSError) as e:
+        # A body cut off mid-stream leaves the connection unusable; report it
+        # as this file's fetch error rather than aborting the whole run.
+        part_path.unlink(missing_ok=True)
+        drop_raw_connection()
+        raise RuntimeError(f"failed to download {url}: {e}") from e
+    part_path.replace(cache_path)
     return cache_path
 
 
+def download_upstream_files(
+    repo_slug: str, subdir: str, commit: str, rel_paths: list[str], jobs: int
+) -> tuple[dict[str, Path], dict[str, str]]:
+    """Fetch `rel_paths` concurrently; return local paths and per-path fetch errors."""
+    local_paths: dict[str, Path] = {}
+    errors: dict[str, str] = {}
+    # Cache hits (every file, on repeat runs at a pinned commit) resolve here
+    # without a worker pool.
+    commit_cache = upstream_cache_dir(repo_slug, subdir) / commit
+    pending: list[str] = []
+    for rel in rel_paths:
+        cache_path = commit_cache / rel
+        if cache_path.exists():
+            local_paths[rel] = cache_path
+        else:
+            pending.append(rel)
+    if not pending:
+        return local_paths, errors
+
+    # Each fetch is an independent, latency-bound GET, so threads suffice.
+    with ThreadPoolExecutor(max_workers=max(1, min(jobs, len(pending)))) as pool:
+        futures = {rel: pool.submit(download_upstream_file, repo_slug, subdir, commit, rel) for rel in pending}
+        for rel, future in futures.items():
+            try:
+                local_paths[rel] = future.result()
+            except RuntimeError as e:
+                errors[rel] = str(e)
+    return local_paths, errors
+
+
+# Comments and string/char literals, matched in one left-to-right pass so that a
+# comment marker inside a literal (or `/*` inside a `//` comment) is not a comment.
+CPP_COMMENT_OR_LITERAL_RE = re.compile(r"//[^\n]*|/\*.*?\*/|\"(?:\\.|[^\"\\\n])*\"|'(?:\\.|[^'\\\n])*'", re.S)
+
+
 def strip_cpp_comments(source: str) -> str:
-    source = re.sub(r"/\*.*?\*/", "", source, flags=re.S)
-    source = re.sub(r"//.*", "", source)
-    return source
+    # Comments are dropped outright (block comments take their newlines with them,
+    # as before, so reported line numbers are unchanged); literals are kept.
+    return CPP_COMMENT_OR_LITERAL_RE.sub(lambda m: m.group() if m.group()[0] in "\"'" else "", source)
 
 
 def estimate_param_count(params: str) -> int:
@@ -306,33 +474,44 @@ def estimate_param_count(params: str) -> int:
     return p.count(",") + 1
 
 
+# Standard function/method declaration/definition with an explicit return type.
+# Anchored to line start to avoid matching regular function calls.
+CPP_FUNC_RE = re.compile(
+    r"^\s*"
+    r"(?:(?:inline|virtual|static|constexpr|friend|explicit|extern)\s+)*"
+    r"[A-Za-z_][A-Za-z0-9_:<>\s*&~]*\s+"
+    r"(?P<name>(?:~?[A-Za-z_][A-Za-z0-9_:~]*|operator\s*(?:\(\)|\[\]|[^\s(]+(?:\s+[^\s(]+)*)))\s*"
+    r"\((?P<params>[^)]*)\)\s*"
+    r"(?:(?:const|override|final|noexcept)\s*)*"
+    r"(?:=\s*(?:0|default|delete)\s*)?"
+    r"(?:;|\{|:|}\s*;?)\s*$"
+)
+# Constructor / destructor declarations (no explicit return type).
+CPP_CTOR_RE = re.compile(
+    r"^\s*(?P<name>[A-Za-z_][A-Za-z0-9_:~]*)\s*"
+    r"\((?P<params>[^)]*)\)\s*"
+    r"(?:(?:const|override|final|noexcept)\s*)*"
+    r"(?:=\s*(?:0|default|delete)\s*)?"
+    r"(?:;|\{|:|}\s*;?)\s*$"
+)
+# Line-scan helpers for extract_cpp_symbols, compiled once rather than per line.
+CLASS_START_RE = re.compile(r"^\s*(class|struct)\b")
+# Every signature-leading keyword (inline, virtual, template, ...) starts with a
+# letter, so a signature line is one whose first non-blank char is in this set.
+SIGNATURE_START_CHARS = frozenset("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz_~")
+STATEMENT_END_RE = re.compile(r"[;{}]$")
+SIGNATURE_END_RE = re.compile(r"(;|\{|:|}\s*;?)\s*$")
+SIGNATURE_CONTINUATION_RE = re.compile(r"^\s*(?:const|override|final|noexcept|->|\{|:|;|=)")
+BODY_RE = re.compile(r"\{.*$")
+SYMBOL_NAME_RE = re.compile(r"^[A-Za-z_]|^operator")
+
+
 def extract_cpp_symbols(path: Path, basename: str) -> list[Symbol]:
     text = path.read_text(errors="replace")
     stripped = strip_cpp_comments(text)
     lines = stripped.splitlines()
     is_source = path.suffix == ".cxx"
 
-    # Standard function/method declaration/definition with an explicit return type.
-    # Anchored to line start to avoid matching regular function calls.
-    func_pat = re.compile(
-        r"^\s*"
-        r"(?:(?:inline|virtual|static|constexpr|friend|explicit|extern)\s+)*"
-        r"[A-Za-z_][A-Za-z0-9_:<>\s*&~]*\s+"
-        r"(?P<name>(?:~?[A-Za-z_][A-Za-z0-9_:~]*|operator\s*(?:\(\)|\[\]|[^\s(]+(?:\s+[^\s(]+)*)))\s*"
-        r"\((?P<params>[^)]*)\)\s*"
-        r"(?:(?:const|override|final|noexcept)\s*)*"
-        r"(?:=\s*(?:0|default|delete)\s*)?"
-        r"(?:;|\{|:|}\s*;?)\s*$"
-    )
-    # Constructor / destructor declarations (no explicit return type).
-    ctor_pat = re.compile(
-        r"^\s*(?P<name>[A-Za-z_][A-Za-z0-9_:~]*)\s*"
-        r"\((?P<params>[^)]*)\)\s*"
-        r"(?:(?:const|override|final|noexcept)\s*)*"
-        r"(?:=\s*(?:0|default|delete)\s*)?"
-        r"(?:;|\{|:|}\s*;?)\s*$"
-    )
-
     # Build multi-line candidate signatures.
     candidates: list[tuple[int, str]] = []
     i = 0
@@ -351,7 +530,8 @@ def extract_cpp_symbols(path: Path, basename: str) -> list[Symbol]:
             i += 1
             continue
 
-        if re.match(r"^\s*(class|struct)\b", raw) and not raw.rstrip().endswith(";"):
+        # startswith gates the regex, which only adds the word-boundary check.
+        if line.startswith(("class", "struct")) and CLASS_START_RE.match(line) and not line.endswith(";"):
             # class definition starts now or on a following line.
             if "{" in raw:
                 class_depth_stack.append(depth + raw.count("{"))
@@ -367,15 +547,15 @@ def extract_cpp_symbols(path: Path, basename: str) -> list[Symbol]:
 
         if allowed_scope and "(" in line:
             # probable signature starts
-            if re.match(r"^\s*(?:inline|virtual|static|constexpr|friend|explicit|extern|template|[A-Za-z_~])", raw):
+            if line[0] in SIGNATURE_START_CHARS:
                 start = i + 1
                 sig = raw.strip()
                 # Multi-line declaration with return type above, e.g.
                 #   virtual MinimumSeed
                 #   operator()(...) const = 0;
-                if re.match(r"^\s*operator", raw) and i > 0:
+                if line.startswith("operator") and i > 0:
                     prev = lines[i - 1].strip()
-                    if prev and "(" not in prev and not re.search(r"[;{}]$", prev):
+                    if prev and "(" not in prev and not STATEMENT_END_RE.search(prev):
                         sig = prev + " " + sig
                         start = i
                 j = i
@@ -383,8 +563,8 @@ def extract_cpp_symbols(path: Path, basename: str) -> list[Symbol]:
                     j += 1
                     sig += " " + lines[j].strip()
                 # consume trailing qualifiers / symbols if needed
-                while j + 1 < n and not re.search(r"(;|\{|:|}\s*;?)\s*$", sig):
-                    if re.match(r"^\s*(?:const|override|final|noexcept|->|\{|:|;|=)", lines[j + 1]):
+                while j + 1 < n and not SIGNATURE_END_RE.search(sig):
+                    if SIGNATURE_CONTINUATION_RE.match(lines[j + 1]):
                         j += 1
                         sig += " " + lines[j].strip()
                     else:
@@ -407,29 +587,29 @@ def extract_cpp_symbols(path: Path, basename: str) -> list[Symbol]:
     seen_line_name: set[tuple[int, str]] = set()
     for line_no, sig in candidates:
         sig_trim = sig.strip()
-        sig_match = re.sub(r"\{.*$", "{", sig_trim)
+        sig_match = BODY_RE.sub("{", sig_trim)
 
         if is_source and "{" not in sig_match and ":" not in sig_match:
             # In .cxx files keep definitions (and ctor init-list starts), skip declarations/initializations.
             continue
 
-        m = func_pat.match(sig_match)
+        m = CPP_FUNC_RE.match(sig_match)
         if not m:
-            m = ctor_pat.match(sig_match)
+            m = CPP_CTOR_RE.match(sig_match)
         if not m:
             continue
         raw_name = m.group("name").strip()
-        short_name = raw_name.split("::")[-1].strip()
+        short_name = raw_name.rpartition("::")[2].strip()
         if short_name in CPP_KEYWORDS:
             continue
         if short_name.startswith("~"):
             # Keep destructor only if it belongs to the target class basename.
             if short_name[1:] != basename:
                 continue
-        if not re.match(r"^[A-Za-z_]|^operator", short_name):
+        if not SYMBOL_NAME_RE.match(short_name):
             continue
         # For constructor pattern, keep only if it is really this class ctor/dtor.
-        if m.re is ctor_pat and short_name not in {basename, f"~{basename}"}:
+        if m.re is CPP_CTOR_RE and short_name not in {basename, f"~{basename}"}:
             continue
 
         key = (line_no, short_name)
@@ -449,23 +629,48 @@ def extract_cpp_symbols(path: Path, basename: str) -> list[Symbol]:
     return sorted(by_key.values(), key=lambda s: (s.line, s.name))
 
 
-def parse_replaces_mirrors_mapping() -> dict[str, set[str]]:
+def iter_rust_files(root: Path) -> Iterator[Path]:
+    # os.scandir entries carry their type, so the walk needs no per-file stat.
+    with os.scandir(root) as entries:
+        for entry in entries:
+            if entry.is_dir():
+                yield from iter_rust_files(Path(entry.path))
+            elif entry.name.endswith(".rs") and entry.is_file():
+                yield Path(entry.path)
+
+
+def read_rust_sources() -> list[tuple[str, str]]:
+    """Return `(repo-relative path, content)` for every src/ Rust file, sorted by path."""
+    # Read once and shared by the Replaces/Mirrors scan and symbol extraction.
+    return [
+        (str(file.relative_to(REPO_ROOT)), file.read_text(errors="replace"))
+        for file in sorted(iter_rust_files(REPO_ROOT / "src"))
+    ]
+
+
+def parse_replaces_mirrors_mapping(rust_sources: list[tuple[str, str]]) -> dict[str, set[str]]:
     mapping: dict[str, set[str]] = defaultdict(set)
-    for file in sorted((REPO_ROOT / "src").rglob("*.rs")):
-        head = "\n".join(file.read_text(errors="replace").splitlines()[:40])
+    for rel, content in rust_sources:
+        # Most files carry neither marker; skip splitting them into lines at all.
+        if "Replaces" not in content and "Mirrors" not in content:
+            continue
+        head = "\n".join(content.splitlines()[:40])
         for m in re.finditer(r"(Replaces|Mirrors)\s+([^\n]+)", head):
             desc = m.group(2)
             for token in re.findall(r"([A-Za-z0-9_./]+\.(?:h|hpp|cxx))", desc):
                 base = token.split("/")[-1].rsplit(".", 1)[0]
-                mapping[base].add(str(file.relative_to(REPO_ROOT)))
+                mapping[base].add(rel)
     return mapping
 
 
+@functools.lru_cache(maxsize=None)
 def normalize_symbol(name: str) -> str:
     return "".join(ch for ch in name.lower() if ch.isalnum())
 
 
-def alternative_upstream_names(name: str, basename: str) -> list[str]:
+# Cached, so the result is a tuple: callers share it and must not mutate it.
+@functools.lru_cache(maxsize=None)
+def alternative_upstream_names(name: str, basename: str) -> tuple[str, ...]:
     n = name.strip()
     alternatives = [n]
 
@@ -493,29 +698,48 @@ def alternative_upstream_names(name: str, basename: str) -> list[str]:
         if a not in seen:
             seen.add(a)
             out.append(a)
-    return out
+    return tuple(out)
+
 
+RUST_FN_RE = re.compile(r"\bfn\s+([A-Za-z_][A-Za-z0-9_]*)\s*\(")
 
-def extract_rust_symbols() -> tuple[list[RustSymbol], dict[str, list[RustSymbol]], dict[str, list[RustSymbol]]]:
+
+@functools.lru_cache(maxsize=None)
+def alternative_upstream_norms(name: str, basename: str) -> tuple[str, ...]:
+    """Normalized, duplicate-free forms of `alternative_upstream_names`, in order."""
+    return tuple(dict.fromkeys(normalize_symbol(a) for a in alternative_upstream_names(name, basename) if a))
+
+
+def extract_rust_symbols(
+    rust_sources: list[tuple[str, str]],
+) -> tuple[
+    list[RustSymbol],
+    dict[str, list[RustSymbol]],
+    dict[str, list[RustSymbol]],
+    dict[str, dict[str, list[RustSymbol]]],
+]:
     symbols: list[RustSymbol] = []
     by_file: dict[str, list[RustSymbol]] = defaultdict(list)
     by_norm: dict[str, list[RustSymbol]] = defaultdict(list)
+    by_file_norm: dict[str, dict[str, list[RustSymbol]]] = defaultdict(lambda: defaultdict(list))
 
-    for file in sorted((REPO_ROOT / "src").rglob("*.rs")):
-        rel = str(file.relative_to(REPO_ROOT))
-        content = file.read_text(errors="replace")
+    for rel, content in rust_sources:
         # Skip in-file test module declarations by cutting at first cfg(test).
         main_part = content.split("#[cfg(test)]", 1)[0]
-        pattern = re.compile(r"\bfn\s+([A-Za-z_][A-Za-z0-9_]*)\s*\(")
-        for m in pattern.finditer(main_part):
+        # Matches arrive in order, so count newlines only since the previous one.
+        line = 1
+        last = 0
+        for m in RUST_FN_RE.finditer(main_part):
             name = m.group(1)
-            line = main_part.count("\n", 0, m.start()) + 1
+            line += main_part.count("\n", last, m.start())
+            last = m.start()
             norm = normalize_symbol(name)
             rs = RustSymbol(name=name, line=line, file=rel, norm=norm)
             symbols.append(rs)
             by_file[rel].append(rs)
             by_norm[norm].append(rs)
-    return symbols, by_file, by_norm
+            by_file_norm[rel][norm].append(rs)
+    return symbols, by_file, by_norm, by_file_norm
 
 
 def parse_args() -> argparse.Namespace:
@@ -539,6 +763,12 @@ def parse_args() -> argparse.Namespace:
         "--commit",
         help="Upstream commit SHA or ref (overrides --tag)",
     )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=16,
+        help="Upstream files downloaded concurrently (default: 16, 1 = serial)",
+    )
     return parser.parse_args()
 
 
@@ -559,8 +789,13 @@ def main() -> int:
     for f in upstream_files:
         file_groups[f.basename].append(f)
 
-    replaces_map = parse_replaces_mirrors_mapping()
-    _, rust_by_file, rust_by_norm = extract_rust_symbols()
+    local_paths, download_errors = download_upstream_files(
+        repo_slug, subdir, commit, sorted({f.path for f in upstream_files}), args.jobs
+    )
+
+    rust_sources = read_rust_sources()
+    replaces_map = parse_replaces_mirrors_mapping(rust_sources)
+    _, rust_by_file, rust_by_norm, rust_by_file_norm = extract_rust_symbols(rust_sources)
 
     rows: list[dict[str, str]] = []
     extracted_symbol_count = 0
@@ -570,17 +805,16 @@ def main() -> int:
         candidates = set(MANUAL_BASE_TO_RUST.get(basename, []))
         candidates.update(replaces_map.get(basename, set()))
         candidates = {c for c in candidates if (REPO_ROOT / c).exists()}
+        sorted_candidates = sorted(candidates)
 
         # Extract and dedupe symbols across all upstream files for this basename.
         extracted: dict[tuple[str, int], tuple[Symbol, str]] = {}
         fetch_errors: list[str] = []
         for uf in sorted(file_groups[basename], key=lambda u: u.path):
-            try:
-                local_path = download_upstream_file(repo_slug, subdir, commit, uf.path)
-            except RuntimeError as e:
-                fetch_errors.append(f"{uf.path}: {e}")
+            if uf.path in download_errors:
+                fetch_errors.append(f"{uf.path}: {download_errors[uf.path]}")
                 continue
-            syms = extract_cpp_symbols(local_path, basename)
+            syms = extract_cpp_symbols(local_paths[uf.path], basename)
             for sym in syms:
                 key = (sym.name, sym.param_count)
                 old = extracted.get(key)
@@ -608,7 +842,7 @@ def main() -> int:
                     "upstream_file": ";".join(sorted({f.path for f in file_groups[basename]})),
                     "upstream_symbol": "<no_symbol_extracted>",
                     "upstream_line": "",
-                    "rust_file": ";".join(sorted(candidates)),
+                    "rust_file": ";".join(sorted_candidates),
                     "rust_symbol": "",
                     "rust_line": "",
                     "status": "needs-review",
@@ -623,16 +857,16 @@ def main() -> int:
 
         for key in sorted(extracted, key=lambda k: (k[0].lower(), k[1])):
             sym, source_path = extracted[key]
-            alts = alternative_upstream_names(sym.name, basename)
-            alt_norms = [normalize_symbol(a) for a in alts if a]
+            alt_norms = alternative_upstream_norms(sym.name, basename)
 
             candidate_matches: list[RustSymbol] = []
-            # First pass: mapped files only.
-            if candidates:
-                for rust_file in sorted(candidates):
-                    for rs in rust_by_file.get(rust_file, []):
-                        if rs.norm in alt_norms:
-                            candidate_matches.append(rs)
+            # First pass: mapped files only. alt_norms is duplicate-free, so each
+            # Rust symbol is picked up at most once, via its own norm.
+            for rust_file in sorted_candidates:
+                file_norms = rust_by_file_norm.get(rust_file)
+                if file_norms:
+                    for n in alt_norms:
+                        candidate_matches.extend(file_norms.get(n, ()))
 
             # Second pass: global search only when no candidate file mapping exists.
             if not candidate_matches and not candidates:
@@ -674,7 +908,7 @@ def main() -> int:
                     status = "intentionally-skipped"
                     rationale = "constructor/destructor/operator handled idiomatically in Rust"
                     # provide a best-effort constructor evidence if available
-                    for rust_file_candidate in sorted(candidates):
+                    for rust_file_candidate in sorted_candidates:
                         ctor_candidates = [rs for rs in rust_by_file.get(rust_file_candidate, []) if rs.name in {"new", "default"}]
                         if ctor_candidates:
                             rs = ctor_candidates[0]
@@ -717,77 +951,23 @@ def main() -> int:
     REPORT_DIR.mkdir(parents=True, exist_ok=True)
 
     csv_path = REPORT_DIR / "functions.csv"
-    with csv_path.open("w", newline="") as f:
-        writer = csv.DictWriter(
-            f,
-            lineterminator="\n",
-            fieldnames=[
-                "upstream_repo",
-                "upstream_subdir",
-                "upstream_ref",
-                "upstream_commit",
-                "upstream_file",
-                "upstream_symbol",
-                "upstream_line",
-                "rust_file",
-                "rust_symbol",
-                "rust_line",
-                "status",
-                "rationale",
-            ],
-        )
-        writer.writeheader()
-        writer.writerows(rows)
-
     missing_csv = REPORT_DIR / "missing.csv"
-    with missing_csv.open("w", newline="") as f:
-        writer = csv.DictWriter(
-            f,
-            lineterminator="\n",
-            fieldnames=[
-                "upstream_repo",
-                "upstream_subdir",
-                "upstream_ref",
-                "upstream_commit",
-                "upstream_file",
-                "upstream_symbol",
-                "upstream_line",
-                "rust_file",
-                "rust_symbol",
-                "rust_line",
-                "status",
-                "rationale",
-            ],
-        )
-        writer.writeheader()
-        for row in rows:
-            if row["status"] == "missing":
-                writer.writerow(row)
-
     review_csv = REPORT_DIR / "needs_review.csv"
-    with review_csv.open("w", newline="") as f:
-        writer = csv.DictWriter(
-            f,
-            lineterminator="\n",
-            fieldnames=[
-                "upstream_repo",
-                "upstream_subdir",
-                "upstream_ref",
-                "upstream_commit",
-                "upstream_file",
-                "upstream_symbol",
-                "upstream_line",
-                "rust_file",
-                "rust_symbol",
-                "rust_line",
-                "status",
-                "rationale",
-            ],
+    # One pass over rows feeds all three CSVs.
+    with ExitStack() as stack:
+        writer, missing_writer, review_writer = (
+            csv.DictWriter(stack.enter_context(path.open("w", newline="")), lineterminator="\n", fieldnames=FUNCTION_FIELDS)
+            for path in (csv_path, missing_csv, review_csv)
         )
         writer.writeheader()
+        missing_writer.writeheader()
+        review_writer.writeheader()
         for row in rows:
-            if row["status"] == "needs-review":
-                writer.writerow(row)
+            writer.writerow(row)
+            if row["status"] == "missing":
+                missing_writer.writerow(row)
+            elif row["status"] == "needs-review":
+                review_writer.writerow(row)
 
     by_status: dict[str, list[dict[str, str]]] = defaultdict(list)
     by_file_missing: dict[str, int] = defaultdict(int)
@@ -805,8 +985,8 @@ def main() -> int:
     review = len(by_status["needs-review"])
     skipped = len(by_status["intentionally-skipped"])
 
-    missing_top = sorted(by_file_missing.items(), key=lambda x: (-x[1], x[0]))[:20]
-    review_top = sorted(by_file_review.items(), key=lambda x: (-x[1], x[0]))[:20]
+    missing_top = heapq.nsmallest(20, by_file_missing.items(), key=lambda x: (-x[1], x[0]))
+    review_top = heapq.nsmallest(20, by_file_review.items(), key=lambda x: (-x[1], x[0]))
 
     gaps_md = REPORT_DIR / "gaps.md"
     lines = [
@@ -840,18 +1020,7 @@ def main() -> int:
         lines.append("- None")
 
     lines.extend(["", "## Notes", ""])
-    lines.extend(
-        textwrap.dedent(
-            """
-            - Symbol extraction is heuristic (regex-based), not a full C++ parser.
-            - `intentionally-skipped` currently captures constructor/destructor/operator-style symbols that map to Rust idioms.
-            - `needs-review` includes architectural refactors where strict 1:1 symbol naming is not expected.
-            - Use `reports/parity/functions.csv` as the source of truth for triage and manual confirmation.
-            """
-        )
-        .strip()
-        .splitlines()
-    )
+    lines.extend(GAPS_NOTES_LINES)
     gaps_md.write_text("\n".join(lines) + "\n")
 
     print(f"Wrote {csv_path.relative_to(REPO_ROOT)} ({len(rows)} rows)")
@@ -16,10 +16,12 @@ from __future__ import annotations
 
 import argparse
 import csv
+import functools
 import json
 import os
 import shutil
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any
 
@@ -28,6 +30,7 @@ REPO_ROOT = Path(__file__).resolve().parents[1]
 DEFAULT_WORKLOADS = REPO_ROOT / "verification" / "workloads" / "root_minuit2_v6_36_08.json"
 DEFAULT_REPORT_DIR = REPO_ROOT / "reports" / "verification" / "reference_coverage"
 DEFAULT_ROOT_TAG = "v6-36-08"
+RESOLVED_REPO_ROOT = REPO_ROOT.resolve()
 
 
 def run(cmd: list[str], *, env: dict[str, str] | None = None) -> str:
@@ -55,6 +58,12 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--root-tag", default=DEFAULT_ROOT_TAG, help="ROOT tag to check out")
     parser.add_argument("--workloads", default=str(DEFAULT_WORKLOADS), help="Workload JSON")
     parser.add_argument("--report-dir", default=str(DEFAULT_REPORT_DIR), help="Output report directory")
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=0,
+        help="Workloads run concurrently (0 = one per CPU, 1 = serial)",
+    )
     return parser.parse_args()
 
 
@@ -85,16 +94,33 @@ def load_workloads(path: Path) -> list[str]:
     return [w["id"] for w in data["workloads"]]
 
 
+def run_workload(wid: str, runner: Path, raw_dir: Path, profraw_dir: Path) -> None:
+    env = os.environ.copy()
+    # `%4m` turns on the profile runtime's online merging: every process of this
+    # workload folds its counters into one of at most four files keyed by the binary's
+    # signature instead of leaving one profraw per PID, which keeps the merge step small.
+    # Stale files are removed in main() before any workload runs, since they would be
+    # merged into rather than overwritten.
+    env["LLVM_PROFILE_FILE"] = str(profraw_dir / f"ref_runner_{wid}_%4m.profraw")
+    out = subprocess.check_output([str(runner), "--workload", wid], cwd=REPO_ROOT, env=env, text=True)
+    (raw_dir / f"{wid}.json").write_text(out.strip() + "\n")
+
+
+@functools.lru_cache(maxsize=None)
 def normalize_file(path: str) -> str:
+    # The export repeats each source file once per function it defines, so caching
+    # keeps resolve() (which stats every component) to one call per distinct file.
     p = Path(path)
     try:
-        return str(p.resolve().relative_to(REPO_ROOT.resolve()))
+        return str(p.resolve().relative_to(RESOLVED_REPO_ROOT))
     except Exception:
         return str(p)
 
 
 def in_scope(filename: str) -> bool:
-    return "/math/minuit2/" in filename or filename.startswith("math/minuit2/")
+    # One substring test covers both absolute (`.../math/minuit2/...`) and
+    # repo-relative (`math/minuit2/...`) export paths.
+    return "math/minuit2/" in filename
 
 
 def main() -> int:
@@ -113,11 +139,17 @@ def main() -> int:
             f.unlink()
     profraw_dir.mkdir(parents=True, exist_ok=True)
 
-    for wid in workload_ids:
-        env = os.environ.copy()
-        env["LLVM_PROFILE_FILE"] = str(profraw_dir / f"ref_runner_{wid}_%p.profraw")
-        out = subprocess.check_output([str(runner), "--workload", wid], cwd=REPO_ROOT, env=env, text=True)
-        (raw_dir / f"{wid}.json").write_text(out.strip() + "\n")
+    # Each workload is its own runner process writing its own profraw/JSON files, so
+    # threads suffice to overlap them; the single merge below still sees every profile.
+    jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+    jobs = max(1, min(jobs, len(workload_ids)))
+    if os.environ.get("MINUIT2_ROOT_TRACE_JSONL"):
+        # Every runner truncates and writes this one trace file, so parallel
+        # workloads would interleave it; run serially, as before.
+        jobs = 1
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        # Drain the iterator so a failing workload raises here.
+        list(pool.map(lambda wid: run_workload(wid, runner, raw_dir, profraw_dir), workload_ids))
 
     profraw_files = sorted(profraw_dir.glob("*.profraw"))
     if not profraw_files:
@@ -129,44 +161,67 @@ def main() -> int:
     merged = raw_dir / "merged.profdata"
     subprocess.check_call([*llvm_profdata, "merge", "-sparse", *[str(p) for p in profraw_files], "-o", str(merged)])
 
+    # The export can run to hundreds of MB: send it straight to disk and parse it back
+    # from there, so the raw text is not kept alive next to the parsed payload.
     export_json_path = raw_dir / "llvm_cov_export.json"
-    export_json = subprocess.check_output(
-        [*llvm_cov, "export", str(runner), f"-instr-profile={merged}"], cwd=REPO_ROOT, text=True
-    )
-    export_json_path.write_text(export_json)
-    payload: dict[str, Any] = json.loads(export_json)
+    with export_json_path.open("wb") as out:
+        subprocess.check_call(
+            [*llvm_cov, "export", str(runner), f"-instr-profile={merged}"], cwd=REPO_ROOT, stdout=out
+        )
+    with export_json_path.open("rb") as f:
+        payload: dict[str, Any] = json.load(f)
 
-    functions: list[tuple[str, str, int]] = []
+    executed: list[tuple[str, str, int]] = []
+    unexecuted: list[tuple[str, str, int]] = []
     total_in_scope = 0
-    executed_in_scope = 0
 
-    file_totals: dict[str, dict[str, int]] = {}
+    # Line totals are summed as files are seen. A path that normalizes to one already
+    # counted replaces its earlier contribution, as the last entry for a file wins.
+    file_lines: dict[str, tuple[int, int]] = {}
+    file_covered = 0
+    file_count = 0
+    # Raw export path -> normalized path, or None when out of scope. Filled by the files
+    # pass and reused for the function entries, which name the same files over and over.
+    file_norms: dict[str, str | None] = {}
     for data_entry in payload.get("data", []):
         for f in data_entry.get("files", []):
-            filename = str(f.get("filename", ""))
-            if not in_scope(filename):
+            filename = f.get("filename") or ""
+            norm = file_norms[filename] = normalize_file(filename) if in_scope(filename) else None
+            if norm is None:
                 continue
-            norm = normalize_file(filename)
             summary = f.get("summary", {}).get("lines", {})
             covered = int(summary.get("covered", 0))
             count = int(summary.get("count", 0))
-            file_totals[norm] = {"covered": covered, "count": count}
+            prev = file_lines.get(norm)
+            if prev is not None:
+                file_covered -= prev[0]
+                file_count -= prev[1]
+            file_lines[norm] = (covered, count)
+            file_covered += covered
+            file_count += count
 
         for fn in data_entry.get("functions", []):
-            name = str(fn.get("name", ""))
-            count = int(fn.get("count", 0))
-            files = [str(f) for f in fn.get("filenames", [])]
-            if not files:
+            filenames = fn.get("filenames")
+            if not filenames:
                 continue
-            primary = files[0]
-            if not in_scope(primary):
+            primary = filenames[0]
+            if primary in file_norms:
+                norm = file_norms[primary]
+            else:
+                norm = file_norms[primary] = normalize_file(primary) if in_scope(primary) else None
+            if norm is None:
                 continue
+            name = str(fn.get("name", ""))
+            count = int(fn.get("count", 0))
             total_in_scope += 1
             if count > 0:
-                executed_in_scope += 1
-            functions.append((name, normalize_file(primary), count))
+                executed.append((name, norm, count))
+            elif count == 0:
+                unexecuted.append((name, norm, count))
 
-    functions.sort(key=lambda x: (x[2] == 0, x[1], x[0]))
+    executed_in_scope = len(executed)
+    executed.sort(key=lambda x: (x[1], x[0]))
+    unexecuted.sort(key=lambda x: (x[1], x[0]))
 
     executed_path = report_dir / "executed_functions.csv"
     unexecuted_path = report_dir / "unexecuted_functions.csv"
@@ -175,19 +230,13 @@ def main() -> int:
     with executed_path.open("w", newline="") as f:
         writer = csv.writer(f)
         writer.writerow(["function", "file", "count"])
-        for name, file_name, count in functions:
-            if count > 0:
-                writer.writerow([name, file_name, count])
+        writer.writerows(executed)
 
     with unexecuted_path.open("w", newline="") as f:
         writer = csv.writer(f)
         writer.writerow(["function", "file", "count"])
-        for name, file_name, count in functions:
-            if count == 0:
-                writer.writerow([name, file_name, count])
+        writer.writerows(unexecuted)
 
-    file_covered = sum(v["covered"] for v in file_totals.values())
-    file_count = sum(v["count"] for v in file_totals.values())
     line_coverage = 0.0 if file_count == 0 else (100.0 * file_covered / file_count)
     function_coverage = 0.0 if total_in_scope == 0 else (100.0 * executed_in_scope / total_in_scope)
 
@@ -16,8 +16,14 @@ from __future__ import annotations
 
 import argparse
 import csv
+import heapq
+import operator
+import re
 from collections import Counter, defaultdict
+from contextlib import contextmanager
+from dataclasses import dataclass
 from pathlib import Path
+from typing import Any, Iterator
 
 
 REPO_ROOT = Path(__file__).resolve().parents[1]
@@ -36,6 +42,56 @@ WAIVER_TYPES_RESOLVE = {
     "api-shape-drift",
 }
 
+# Parity CSV columns read per row, in the order main() unpacks them.
+PARITY_FIELDS = (
+    "upstream_repo",
+    "upstream_subdir",
+    "upstream_ref",
+    "upstream_commit",
+    "upstream_file",
+    "upstream_symbol",
+    "upstream_line",
+    "rust_file",
+    "rust_symbol",
+    "rust_line",
+    "status",
+    "rationale",
+)
+
+# Column order of the matrix; rows are written as tuples in this order.
+MATRIX_FIELDS = (
+    "legacy_id",
+    "upstream_repo",
+    "upstream_subdir",
+    "upstream_ref",
+    "upstream_commit",
+    "upstream_file",
+    "upstream_symbol",
+    "upstream_line",
+    "rust_file",
+    "rust_symbol",
+    "rust_line",
+    "raw_status",
+    "effective_status",
+    "waived",
+    "waiver_type",
+    "waiver_reason",
+    "waiver_source",
+    "ambiguous_implemented",
+    "rationale",
+)
+
+
+@dataclass(frozen=True)
+class WaiverRule:
+    raw_status: str
+    rationale_contains: str
+    # Compiled once at load; None when the CSV cell is empty (matches anything).
+    upstream_file_re: re.Pattern[str] | None
+    upstream_symbol_re: re.Pattern[str] | None
+    waiver_type: str
+    reason: str
+
 
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Generate legacy->Rust traceability matrix")
@@ -72,11 +128,11 @@ def read_waivers(path: Path) -> dict[str, dict[str, str]]:
     return out
 
 
-def read_waiver_rules(path: Path) -> list[dict[str, str]]:
+def read_waiver_rules(path: Path) -> list[WaiverRule]:
     if not path.exists():
         return []
 
-    out: list[dict[str, str]] = []
+    out: list[WaiverRule] = []
     with path.open(newline="") as f:
         reader = csv.DictReader(f)
         required = {
@@ -91,15 +147,17 @@ def read_waiver_rules(path: Path) -> list[dict[str, str]]:
         if missing:
             raise ValueError(f"waiver rules file missing columns: {sorted(missing)}")
         for row in reader:
+            file_re = row["upstream_file_regex"].strip()
+            symbol_re = row["upstream_symbol_regex"].strip()
             out.append(
-                {
-                    "raw_status": row["raw_status"].strip(),
-                    "rationale_contains": row["rationale_contains"].strip(),
-                    "upstream_file_regex": row["upstream_file_regex"].strip(),
-                    "upstream_symbol_regex": row["upstream_symbol_regex"].strip(),
-                    "waiver_type": row["waiver_type"].strip(),
-                    "reason": row["reason"].strip(),
-                }
+                WaiverRule(
+                    raw_status=row["raw_status"].strip(),
+                    rationale_contains=row["rationale_contains"].strip(),
+                    upstream_file_re=re.compile(file_re) if file_re else None,
+                    upstream_symbol_re=re.compile(symbol_re) if symbol_re else None,
+                    waiver_type=row["waiver_type"].strip(),
+                    reason=row["reason"].strip(),
+                )
             )
     return out
 
@@ -110,73 +168,82 @@ def mk_legacy_id(upstream_file: str, upstream_symbol: str, upstream_line: str) -
     return f"{upstream_file}::{upstream_symbol}@{line_part}"
 
 
-def classify_ambiguous_as_implemented(row: dict[str, str]) -> bool:
-    return (
-        row.get("status") == "needs-review"
-        and row.get("rationale") == "multiple Rust symbol candidates"
-        and bool(row.get("rust_file", "").strip())
-        and bool(row.get("rust_symbol", "").strip())
-        and row.get("upstream_symbol") != "<no_symbol_extracted>"
-    )
-
-
-def map_effective_status(
+def classify_status(
     raw_status: str,
+    rationale: str,
+    rust_file: str,
+    rust_symbol: str,
+    upstream_symbol: str,
     waiver_type: str | None,
-    ambiguous_implemented: bool,
-) -> str:
-    if ambiguous_implemented:
-        return "implemented"
-    if raw_status == "implemented":
-        return "implemented"
+) -> tuple[str, bool]:
+    """Return (effective_status, ambiguous_implemented) for one parity row."""
+    # Most selective test first.
+    ambiguous_implemented = (
+        raw_status == "needs-review"
+        and rationale == "multiple Rust symbol candidates"
+        and bool(rust_file.strip())
+        and bool(rust_symbol.strip())
+        and upstream_symbol != "<no_symbol_extracted>"
+    )
+    if ambiguous_implemented or raw_status == "implemented":
+        return "implemented", ambiguous_implemented
     if waiver_type and waiver_type in WAIVER_TYPES_RESOLVE:
-        return "waived"
+        return "waived", False
     if raw_status == "intentionally-skipped":
-        return "waived"
-    return "unresolved"
+        return "waived", False
+    return "unresolved", False
 
 
-def apply_rule_waiver(row: dict[str, str], rules: list[dict[str, str]]) -> dict[str, str] | None:
-    import re
-
+def apply_rule_waiver(
+    rules: list[WaiverRule],
+    raw_status: str,
+    rationale: str,
+    upstream_file: str,
+    upstream_symbol: str,
+) -> dict[str, str] | None:
+    # Cheapest checks first: status equality, then substring, then the regexes.
     for rule in rules:
-        if rule["raw_status"] and rule["raw_status"] != row["status"]:
+        if rule.raw_status and rule.raw_status != raw_status:
             continue
-        if rule["rationale_contains"] and rule["rationale_contains"] not in row.get("rationale", ""):
+        if rule.rationale_contains and rule.rationale_contains not in rationale:
             continue
-        if rule["upstream_file_regex"] and not re.search(rule["upstream_file_regex"], row.get("upstream_file", "")):
+        if rule.upstream_file_re and not rule.upstream_file_re.search(upstream_file):
             continue
-        if rule["upstream_symbol_regex"] and not re.search(rule["upstream_symbol_regex"], row.get("upstream_symbol", "")):
+        if rule.upstream_symbol_re and not rule.upstream_symbol_re.search(upstream_symbol):
             continue
         return {
-            "waiver_type": rule["waiver_type"],
-            "reason": rule["reason"],
+            "waiver_type": rule.waiver_type,
+            "reason": rule.reason,
             "source": "rule",
         }
     return None
 
 
-def write_csv(path: Path, rows: list[dict[str, str]]) -> None:
+@contextmanager
+def open_writer(path: Path, fieldnames: tuple[str, ...]) -> Iterator[Any]:
+    """Yield a csv writer whose output replaces `path` only if the block succeeds."""
+    # Rows are written as they are built, so stage them next to the target;
+    # a validation error part-way through leaves the previous matrix intact.
     path.parent.mkdir(parents=True, exist_ok=True)
-    if not rows:
-        raise ValueError("no rows to write")
-    fieldnames = list(rows[0].keys())
-    with path.open("w", newline="") as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-        writer.writerows(rows)
-
-
-def render_summary(rows: list[dict[str, str]], waivers_path: Path, waiver_rules_path: Path) -> str:
-    by_effective = Counter(row["effective_status"] for row in rows)
-    by_raw = Counter(row["raw_status"] for row in rows)
-
-    unresolved_by_file: dict[str, int] = defaultdict(int)
-    for row in rows:
-        if row["effective_status"] == "unresolved":
-            unresolved_by_file[row["upstream_file"]] += 1
-
-    top_unresolved = sorted(unresolved_by_file.items(), key=lambda x: (-x[1], x[0]))[:20]
+    tmp_path = path.with_name(path.name + ".tmp")
+    try:
+        with tmp_path.open("w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(fieldnames)
+            yield writer
+        tmp_path.replace(path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+
+
+def render_summary(
+    by_effective: Counter[str],
+    by_raw: Counter[str],
+    unresolved_by_file: dict[str, int],
+    waivers_path: Path,
+    waiver_rules_path: Path,
+) -> str:
+    top_unresolved = heapq.nsmallest(20, unresolved_by_file.items(), key=lambda x: (-x[1], x[0]))
 
     lines: list[str] = []
     lines.append("# Traceability Summary")
@@ -228,95 +295,107 @@ def main() -> int:
     waivers = read_waivers(waivers_csv)
     waiver_rules = read_waiver_rules(waiver_rules_csv)
 
-    rows_out: list[dict[str, str]] = []
     seen_legacy_ids: set[str] = set()
+    # Summary tallies are kept while streaming, instead of holding every output row.
+    by_effective: Counter[str] = Counter()
+    by_raw: Counter[str] = Counter()
+    unresolved_by_file: dict[str, int] = defaultdict(int)
 
-    with parity_csv.open(newline="") as f:
-        reader = csv.DictReader(f)
-        required = {
-            "upstream_repo",
-            "upstream_subdir",
-            "upstream_ref",
-            "upstream_commit",
-            "upstream_file",
-            "upstream_symbol",
-            "upstream_line",
-            "rust_file",
-            "rust_symbol",
-            "rust_line",
-            "status",
-            "rationale",
-        }
-        missing = required - set(reader.fieldnames or [])
+    with parity_csv.open(newline="") as f, open_writer(out_csv, MATRIX_FIELDS) as writer:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        missing = set(PARITY_FIELDS) - set(header)
         if missing:
             raise ValueError(f"parity csv missing columns: {sorted(missing)}")
+        # Resolve column positions once; each row is then unpacked by index.
+        parity_fields = operator.itemgetter(*(header.index(name) for name in PARITY_FIELDS))
 
-        for row in reader:
+        for record in reader:
+            if not record:
+                continue
+            (
+                upstream_repo,
+                upstream_subdir,
+                upstream_ref,
+                upstream_commit,
+                upstream_file,
+                upstream_symbol,
+                upstream_line,
+                rust_file,
+                rust_symbol,
+                rust_line,
+                raw_status,
+                rationale,
+            ) = parity_fields(record)
             legacy_id = mk_legacy_id(
-                upstream_file=row["upstream_file"],
-                upstream_symbol=row["upstream_symbol"],
-                upstream_line=row["upstream_line"],
+                upstream_file=upstream_file,
+                upstream_symbol=upstream_symbol,
+                upstream_line=upstream_line,
             )
             if legacy_id in seen_legacy_ids:
                 raise ValueError(f"duplicate legacy id in parity csv: {legacy_id}")
             seen_legacy_ids.add(legacy_id)
 
             explicit_waiver = waivers.get(legacy_id)
-            implicit_waiver = apply_rule_waiver(row, waiver_rules)
+            implicit_waiver = apply_rule_waiver(waiver_rules, raw_status, rationale, upstream_file, upstream_symbol)
             waiver = explicit_waiver or implicit_waiver
             waiver_type = (waiver or {}).get("waiver_type")
-            raw_status = row["status"]
-            ambiguous_implemented = classify_ambiguous_as_implemented(row)
-            effective_status = map_effective_status(raw_status, waiver_type, ambiguous_implemented)
-
-            rows_out.append(
-                {
-                    "legacy_id": legacy_id,
-                    "upstream_repo": row["upstream_repo"],
-                    "upstream_subdir": row["upstream_subdir"],
-                    "upstream_ref": row["upstream_ref"],
-                    "upstream_commit": row["upstream_commit"],
-                    "upstream_file": row["upstream_file"],
-                    "upstream_symbol": row["upstream_symbol"],
-                    "upstream_line": row["upstream_line"],
-                    "rust_file": row["rust_file"],
-                    "rust_symbol": row["rust_symbol"],
-                    "rust_line": row["rust_line"],
-                    "raw_status": raw_status,
-                    "effective_status": effective_status,
-                    "waived": "true" if effective_status == "waived" else "false",
-                    "waiver_type": waiver_type or ("intentional" if raw_status == "intentionally-skipped" else ""),
-                    "waiver_reason": (waiver or {}).get(
+            effective_status, ambiguous_implemented = classify_status(
+                raw_status, rationale, rust_file, rust_symbol, upstream_symbol, waiver_type
+            )
+
+            by_effective[effective_status] += 1
+            by_raw[raw_status] += 1
+            if effective_status == "unresolved":
+                unresolved_by_file[upstream_file] += 1
+            writer.writerow(
+                (
+                    legacy_id,
+                    upstream_repo,
+                    upstream_subdir,
+                    upstream_ref,
+                    upstream_commit,
+                    upstream_file,
+                    upstream_symbol,
+                    upstream_line,
+                    rust_file,
+                    rust_symbol,
+                    rust_line,
+                    raw_status,
+                    effective_status,
+                    "true" if effective_status == "waived" else "false",
+                    waiver_type or ("intentional" if raw_status == "intentionally-skipped" else ""),
+                    (waiver or {}).get(
                         "reason",
                         "constructor/destructor/operator handled idiomatically in Rust"
                         if raw_status == "intentionally-skipped"
                         else "",
                     ),
-                    "waiver_source": (waiver or {}).get("source", "auto-intentional" if raw_status == "intentionally-skipped" else ""),
-                    "ambiguous_implemented": "true" if ambiguous_implemented else "false",
-                    "rationale": row["rationale"],
-                }
+                    (waiver or {}).get("source", "auto-intentional" if raw_status == "intentionally-skipped" else ""),
+                    "true" if ambiguous_implemented else "false",
+                    rationale,
+                )
             )
 
-    # Validate that all waivers point to known legacy IDs.
-    unknown_waivers = sorted(set(waivers.keys()) - seen_legacy_ids)
-    if unknown_waivers:
-        sample = ", ".join(unknown_waivers[:5])
-        raise ValueError(f"waiver legacy_id not found in parity matrix: {sample}")
+        if not seen_legacy_ids:
+            raise ValueError("no rows to write")
+        # Validate that all waivers point to known legacy IDs.
+        unknown_waivers = sorted(set(waivers.keys()) - seen_legacy_ids)
+        if unknown_waivers:
+            sample = ", ".join(unknown_waivers[:5])
+            raise ValueError(f"waiver legacy_id not found in parity matrix: {sample}")
 
-    write_csv(out_csv, rows_out)
-    summary = render_summary(rows_out, waivers_csv, waiver_rules_csv)
+    summary = render_summary(by_effective, by_raw, unresolved_by_file, waivers_csv, waiver_rules_csv)
     out_md.parent.mkdir(parents=True, exist_ok=True)
     out_md.write_text(summary + "\n")
 
-    effective = Counter(row["effective_status"] for row in rows_out)
     print(f"Wrote {out_csv.relative_to(REPO_ROOT)}")
     print(f"Wrote {out_md.relative_to(REPO_ROOT)}")
     print(
         "Effective status counts: "
-        f"implemented={effective['implemented']} "
-        f"waived={effective['waived']} "
-        f"unresolved={effective['unresolved']}"
+        f"implemented={by_effective['implemented']} "
+        f"waived={by_effective['waived']} "
+        f"unresolved={by_effective['unresolved']}"
     )
     return 0
 
@@ -20,12 +20,18 @@ Outputs:
 from __future__ import annotations
 
 import csv
+import heapq
+import io
 import json
+import mmap
 import re
 import subprocess
-from collections import Counter, defaultdict
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime, timezone
 from pathlib import Path
+from typing import Iterator
 
 
 REPO_ROOT = Path(__file__).resolve().parents[1]
@@ -43,19 +49,39 @@ OUT_MANIFEST_PATH = REPO_ROOT / "reports" / "verification" / "manifest.json"
 OUT_SCORECARD_PATH = REPO_ROOT / "reports" / "verification" / "scorecard.md"
 
 
+# TOTAL_RE and BENCH_BLOCK_RE are bytes patterns (the µ is matched as its UTF-8
+# encoding) so the raw logs can be scanned straight from a memory map, as in
+# generate_benchmark_report.py.
+
+# Searched over the whole report; [ \t] keeps every field on the TOTAL line itself.
 TOTAL_RE = re.compile(
-    r"^TOTAL\s+\d+\s+\d+\s+(?P<regions>[0-9.]+)%\s+"
-    r"\d+\s+\d+\s+(?P<functions>[0-9.]+)%\s+"
-    r"\d+\s+\d+\s+(?P<lines>[0-9.]+)%\s+"
+    rb"^[ \t]*TOTAL[ \t]+\d+[ \t]+\d+[ \t]+(?P<regions>[0-9.]+)%[ \t]+"
+    rb"\d+[ \t]+\d+[ \t]+(?P<functions>[0-9.]+)%[ \t]+"
+    rb"\d+[ \t]+\d+[ \t]+(?P<lines>[0-9.]+)%[ \t]+",
+    re.MULTILINE,
 )
 
 BENCH_BLOCK_RE = re.compile(
-    r"(?m)^(?P<name>[^\n].+?)\n"
-    r"\s*time:\s+\["
-    r"(?P<low>[0-9.]+)\s*(?P<low_unit>ns|µs|ms|s)\s+"
-    r"(?P<mid>[0-9.]+)\s*(?P<mid_unit>ns|µs|ms|s)\s+"
-    r"(?P<high>[0-9.]+)\s*(?P<high_unit>ns|µs|ms|s)\]\s*$"
+    (
+        r"(?m)^(?P<name>[^\n].+?)\n"
+        r"\s*time:\s+\["
+        r"(?P<low>[0-9.]+)\s*(?P<low_unit>ns|µs|ms|s)\s+"
+        r"(?P<mid>[0-9.]+)\s*(?P<mid_unit>ns|µs|ms|s)\s+"
+        r"(?P<high>[0-9.]+)\s*(?P<high_unit>ns|µs|ms|s)\]\s*$"
+    ).encode("utf-8")
+)
+
+# A "## Known P0 Gap..." section runs to the next level-2 heading that is not one itself.
+P0_SECTION_RE = re.compile(
+    r"^## Known P0 Gap[^\n]*(?P<body>.*?)(?=^## (?![^\n]*Known P0 Gap)|\Z)",
+    re.MULTILINE | re.DOTALL,
 )
+# Table rows in that section, minus the header and separator rows.
+P0_ROW_RE = re.compile(r"^[ \t]*\|(?![^\n]*(?:---|ROOT test intent))", re.MULTILINE)
+
+# The only Criterion benchmarks the scorecard reports.
+SCAN_SERIAL_BENCH = "Quadratic 2D: MnScan serial (101 points)"
+SCAN_PARALLEL_BENCH = "Quadratic 2D: MnScan parallel (101 points)"
 
 UNIT_TO_US = {
     "ns": 0.001,
@@ -74,83 +100,107 @@ def to_us(value: float, unit: str) -> float:
 
 
 def parse_diff_results(path: Path) -> tuple[dict[str, int], int]:
-    counts = Counter()
+    # Only these three statuses are reported, so tally them directly.
+    pass_n = warn_n = fail_n = 0
     total = 0
-    with path.open(newline="") as f:
-        for row in csv.DictReader(f):
-            status = row.get("status", "").strip()
-            if status:
-                counts[status] += 1
+    with path.open(newline="", buffering=1 << 20) as f:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        if "status" not in header:
+            raise ValueError(f"{path} missing columns: ['status']")
+        status_idx = header.index("status")
+        for row in reader:
+            if not row:
+                continue
+            status = row[status_idx].strip()
+            if status == "pass":
+                pass_n += 1
+            elif status == "warn":
+                warn_n += 1
+            elif status == "fail":
+                fail_n += 1
             total += 1
-    return {"pass": counts["pass"], "warn": counts["warn"], "fail": counts["fail"]}, total
+    return {"pass": pass_n, "warn": warn_n, "fail": fail_n}, total
 
 
 def parse_traceability(path: Path) -> tuple[dict[str, int], int, list[tuple[str, int]]]:
-    counts = Counter()
+    implemented_n = waived_n = unresolved_n = 0
     unresolved_by_file: dict[str, int] = defaultdict(int)
     total = 0
-    with path.open(newline="") as f:
-        for row in csv.DictReader(f):
-            effective = row.get("effective_status", "").strip()
-            if effective:
-                counts[effective] += 1
-            if effective == "unresolved":
-                unresolved_by_file[row.get("upstream_file", "")] += 1
+    with path.open(newline="", buffering=1 << 20) as f:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        missing = {"effective_status", "upstream_file"} - set(header)
+        if missing:
+            raise ValueError(f"{path} missing columns: {sorted(missing)}")
+        status_idx = header.index("effective_status")
+        file_idx = header.index("upstream_file")
+        for row in reader:
+            if not row:
+                continue
+            effective = row[status_idx].strip()
+            if effective == "implemented":
+                implemented_n += 1
+            elif effective == "waived":
+                waived_n += 1
+            elif effective == "unresolved":
+                unresolved_n += 1
+                unresolved_by_file[row[file_idx]] += 1
             total += 1
-    top_unresolved = sorted(unresolved_by_file.items(), key=lambda x: (-x[1], x[0]))[:10]
+    top_unresolved = heapq.nsmallest(10, unresolved_by_file.items(), key=lambda x: (-x[1], x[0]))
     return (
         {
-            "implemented": counts["implemented"],
-            "waived": counts["waived"],
-            "unresolved": counts["unresolved"],
+            "implemented": implemented_n,
+            "waived": waived_n,
+            "unresolved": unresolved_n,
         },
         total,
         top_unresolved,
     )
 
 
+@contextmanager
+def mapped_file(path: Path) -> Iterator[bytes | mmap.mmap]:
+    """Map `path` read-only; matches against it must be consumed inside the block."""
+    if path.stat().st_size == 0:
+        # mmap cannot map an empty file.
+        yield b""
+        return
+    with path.open("rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        yield mm
+
+
 def parse_total_coverage(path: Path) -> dict[str, float]:
-    for line in path.read_text().splitlines():
-        m = TOTAL_RE.match(line.strip())
-        if m:
-            return {
-                "regions_pct": float(m.group("regions")),
-                "functions_pct": float(m.group("functions")),
-                "lines_pct": float(m.group("lines")),
-            }
-    raise ValueError(f"TOTAL coverage row not found in {path}")
-
-
-def parse_benchmarks(path: Path) -> dict[str, tuple[float, str]]:
-    raw = path.read_text()
+    with mapped_file(path) as raw:
+        m = TOTAL_RE.search(raw)
+        if not m:
+            raise ValueError(f"TOTAL coverage row not found in {path}")
+        return {
+            "regions_pct": float(m.group("regions")),
+            "functions_pct": float(m.group("functions")),
+            "lines_pct": float(m.group("lines")),
+        }
+
+
+def parse_benchmarks(path: Path, wanted: frozenset[str] | None = None) -> dict[str, tuple[float, str]]:
+    """Map benchmark name -> (median_us, label); with `wanted`, stop once all of those are seen."""
     out: dict[str, tuple[float, str]] = {}
-    for m in BENCH_BLOCK_RE.finditer(raw):
-        name = m.group("name").strip()
-        median = float(m.group("mid"))
-        unit = m.group("mid_unit")
-        out[name] = (to_us(median, unit), f"{median:.4g} {unit}")
+    with mapped_file(path) as raw:
+        for m in BENCH_BLOCK_RE.finditer(raw):
+            name_b, mid_b, unit_b = m.group("name", "mid", "mid_unit")
+            name = name_b.decode("utf-8").strip()
+            if wanted is not None and name not in wanted:
+                continue
+            median = float(mid_b)
+            unit = unit_b.decode("utf-8")
+            out[name] = (to_us(median, unit), f"{median:.4g} {unit}")
+            if wanted is not None and len(out) == len(wanted):
+                break
     return out
 
 
 def parse_p0_gap_count(path: Path) -> int:
-    lines = path.read_text().splitlines()
-    in_section = False
-    count = 0
-    for line in lines:
-        if line.startswith("## ") and "Known P0 Gap" not in line:
-            in_section = False
-        if line.startswith("## Known P0 Gap"):
-            in_section = True
-            continue
-        if not in_section:
-            continue
-        stripped = line.strip()
-        if not stripped.startswith("|"):
-            continue
-        if "---" in stripped or "ROOT test intent" in stripped:
-            continue
-        count += 1
-    return count
+    return sum(len(P0_ROW_RE.findall(m.group("body"))) for m in P0_SECTION_RE.finditer(path.read_text()))
 
 
 def parse_reference_coverage_manifest(path: Path) -> dict[str, object] | None:
@@ -185,30 +235,58 @@ def parse_executed_surface_manifest(path: Path) -> dict[str, object] | None:
     }
 
 
+def write_text_atomic(path: Path, text: str) -> None:
+    """Replace `path` with `text` in one step, so concurrent readers never see a partial file."""
+    tmp_path = path.with_name(path.name + ".tmp")
+    try:
+        tmp_path.write_text(text)
+        tmp_path.replace(path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+
+
 def yes_no(flag: bool) -> str:
     return "YES" if flag else "NO"
 
 
 def main() -> int:
-    workloads = json.loads(WORKLOADS_PATH.read_text())
-    diff_counts, diff_total = parse_diff_results(DIFF_RESULTS_PATH)
-    trace_counts, trace_total, top_unresolved = parse_traceability(TRACEABILITY_PATH)
-    core_cov = parse_total_coverage(CORE_COVERAGE_RAW_PATH)
-    all_cov = parse_total_coverage(ALL_COVERAGE_RAW_PATH)
-    p0_gap_count = parse_p0_gap_count(ROOT_TEST_STATUS_PATH)
-    ref_cov = parse_reference_coverage_manifest(REF_COVERAGE_MANIFEST_PATH)
-    exec_surface = parse_executed_surface_manifest(EXEC_SURFACE_MANIFEST_PATH)
-
-    bench_default = parse_benchmarks(BENCH_DEFAULT_RAW_PATH)
-    bench_parallel = parse_benchmarks(BENCH_PARALLEL_RAW_PATH)
-    scan_serial_name = "Quadratic 2D: MnScan serial (101 points)"
-    scan_parallel_name = "Quadratic 2D: MnScan parallel (101 points)"
-    scan_serial_default = bench_default.get(scan_serial_name)
-    scan_serial_parallel = bench_parallel.get(scan_serial_name)
-    scan_parallel_parallel = bench_parallel.get(scan_parallel_name)
+    # Each probe is its own fork/exec and none depends on another, so overlap them
+    # with each other and with the report parsing below, which is GIL-bound and
+    # finishes well before the toolchain answers.
+    # One rev-parse answers both the commit and (via --abbrev-ref) the branch name.
+    probes = [
+        ["git", "rev-parse", "HEAD", "--abbrev-ref", "HEAD"],
+        ["git", "status", "--porcelain"],
+        ["rustc", "--version"],
+        ["cargo", "--version"],
+        ["python3", "--version"],
+    ]
+    with ThreadPoolExecutor(max_workers=len(probes)) as pool:
+        probe_results = pool.map(run_cmd, probes)
+
+        workloads = json.loads(WORKLOADS_PATH.read_text())
+        diff_counts, diff_total = parse_diff_results(DIFF_RESULTS_PATH)
+        trace_counts, trace_total, top_unresolved = parse_traceability(TRACEABILITY_PATH)
+        core_cov = parse_total_coverage(CORE_COVERAGE_RAW_PATH)
+        all_cov = parse_total_coverage(ALL_COVERAGE_RAW_PATH)
+        p0_gap_count = parse_p0_gap_count(ROOT_TEST_STATUS_PATH)
+        ref_cov = parse_reference_coverage_manifest(REF_COVERAGE_MANIFEST_PATH)
+        exec_surface = parse_executed_surface_manifest(EXEC_SURFACE_MANIFEST_PATH)
+        bench_default = parse_benchmarks(BENCH_DEFAULT_RAW_PATH, frozenset({SCAN_SERIAL_BENCH}))
+        bench_parallel = parse_benchmarks(
+            BENCH_PARALLEL_RAW_PATH, frozenset({SCAN_SERIAL_BENCH, SCAN_PARALLEL_BENCH})
+        )
+
+        git_rev, git_status, rustc_version, cargo_version, python_version = probe_results
+    git_commit, git_branch = git_rev.splitlines()
+
+    # Entries are (median_us, label); a benchmark absent from its log leaves both None.
+    _, serial_default_label = bench_default.get(SCAN_SERIAL_BENCH, (None, None))
+    serial_parallel_us, serial_parallel_label = bench_parallel.get(SCAN_SERIAL_BENCH, (None, None))
+    parallel_parallel_us, parallel_parallel_label = bench_parallel.get(SCAN_PARALLEL_BENCH, (None, None))
     scan_speedup = None
-    if scan_serial_parallel and scan_parallel_parallel and scan_parallel_parallel[0] > 0.0:
-        scan_speedup = scan_serial_parallel[0] / scan_parallel_parallel[0]
+    if serial_parallel_us is not None and parallel_parallel_us is not None and parallel_parallel_us > 0.0:
+        scan_speedup = serial_parallel_us / parallel_parallel_us
 
     differential_gate = diff_counts["fail"] == 0
     traceability_gate = trace_counts["unresolved"] == 0
@@ -217,21 +295,20 @@ def main() -> int:
     full_1to1_gate = differential_gate and traceability_gate and root_p0_gate and executed_surface_gate
     full_100_verifiable = full_1to1_gate and diff_counts["warn"] == 0
 
+    generated_at = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
     manifest = {
-        "generated_at_utc": datetime.now(timezone.utc)
-        .replace(microsecond=0)
-        .isoformat()
-        .replace("+00:00", "Z"),
+        "generated_at_utc": generated_at,
         "project": {
             "name": "minuit2-rs",
-            "git_branch": run_cmd(["git", "rev-parse", "--abbrev-ref", "HEAD"]),
-            "git_commit": run_cmd(["git", "rev-parse", "HEAD"]),
-            "git_dirty": bool(run_cmd(["git", "status", "--porcelain"])),
+            "git_branch": git_branch,
+            "git_commit": git_commit,
+            "git_dirty": bool(git_status),
         },
         "environment": {
-            "rustc": run_cmd(["rustc", "--version"]),
-            "cargo": run_cmd(["cargo", "--version"]),
-            "python3": run_cmd(["python3", "--version"]),
+            "rustc": rustc_version,
+            "cargo": cargo_version,
+            "python3": python_version,
         },
         "reference": workloads["reference"],
         "differential": {
@@ -255,9 +332,9 @@ def main() -> int:
         "reference_coverage": ref_cov,
         "executed_surface": exec_surface,
         "benchmarks": {
-            "scan_serial_default": scan_serial_default[1] if scan_serial_default else None,
-            "scan_serial_parallel_feature": scan_serial_parallel[1] if scan_serial_parallel else None,
-            "scan_parallel_parallel_feature": scan_parallel_parallel[1] if scan_parallel_parallel else None,
+            "scan_serial_default": serial_default_label,
+            "scan_serial_parallel_feature": serial_parallel_label,
+            "scan_parallel_parallel_feature": parallel_parallel_label,
             "scan_speedup_serial_over_parallel": scan_speedup,
         },
         "claims": {
@@ -269,125 +346,107 @@ def main() -> int:
     }
 
     OUT_MANIFEST_PATH.parent.mkdir(parents=True, exist_ok=True)
-    OUT_MANIFEST_PATH.write_text(json.dumps(manifest, indent=2) + "\n")
-
-    lines: list[str] = []
-    lines.append("# Verification Scorecard (Claim-Oriented)")
-    lines.append("")
-    lines.append(f"- Generated at: `{manifest['generated_at_utc']}`")
-    lines.append(f"- Rust commit: `{manifest['project']['git_commit']}`")
-    lines.append(f"- Reference repo: `{manifest['reference']['repo']}`")
-    lines.append(f"- Reference subtree: `{manifest['reference']['subdir']}`")
-    lines.append(f"- Reference tag: `{manifest['reference']['tag']}`")
-    lines.append(f"- Reference commit: `{manifest['reference']['commit']}`")
-    lines.append("")
-    lines.append("## Evidence Snapshot")
-    lines.append("")
-    lines.append(
+    write_text_atomic(OUT_MANIFEST_PATH, json.dumps(manifest, indent=2) + "\n")
+
+    buf = io.StringIO()
+    w = buf.write
+    # Fixed-shape blocks are single (implicitly concatenated) writes; only the
+    # optional evidence lines and blocking gaps are written piecemeal.
+    w(
+        "# Verification Scorecard (Claim-Oriented)\n\n"
+        f"- Generated at: `{generated_at}`\n"
+        f"- Rust commit: `{manifest['project']['git_commit']}`\n"
+        f"- Reference repo: `{manifest['reference']['repo']}`\n"
+        f"- Reference subtree: `{manifest['reference']['subdir']}`\n"
+        f"- Reference tag: `{manifest['reference']['tag']}`\n"
+        f"- Reference commit: `{manifest['reference']['commit']}`\n"
+        "\n## Evidence Snapshot\n\n"
         "- Differential workloads: "
-        f"**{diff_total}** (pass={diff_counts['pass']}, warn={diff_counts['warn']}, fail={diff_counts['fail']})"
-    )
-    lines.append(
+        f"**{diff_total}** (pass={diff_counts['pass']}, warn={diff_counts['warn']}, fail={diff_counts['fail']})\n"
         "- Traceability symbols: "
         f"**{trace_total}** (implemented={trace_counts['implemented']}, "
-        f"waived={trace_counts['waived']}, unresolved={trace_counts['unresolved']})"
-    )
-    lines.append(f"- Known ROOT P0 gaps: **{p0_gap_count}**")
-    lines.append(
+        f"waived={trace_counts['waived']}, unresolved={trace_counts['unresolved']})\n"
+        f"- Known ROOT P0 gaps: **{p0_gap_count}**\n"
         "- Coverage (line): "
         f"`--no-default-features` **{core_cov['lines_pct']:.2f}%**, "
-        f"`--all-features` **{all_cov['lines_pct']:.2f}%**"
+        f"`--all-features` **{all_cov['lines_pct']:.2f}%**\n"
     )
     if ref_cov:
-        lines.append(
+        w(
             "- Reference C++ executed-surface: "
             f"{ref_cov['functions_executed']}/{ref_cov['functions_in_scope']} functions "
-            f"(**{ref_cov['function_coverage_pct']:.2f}%**) across `math/minuit2`"
+            f"(**{ref_cov['function_coverage_pct']:.2f}%**) across `math/minuit2`\n"
         )
     if exec_surface:
         pc = exec_surface["priority_counts"]
-        lines.append(
+        w(
             "- Executed-surface unmapped gaps: "
             f"P0={pc['P0']}, P1={pc['P1']}, P2={pc['P2']} "
-            f"(gate={yes_no(bool(exec_surface['gate_pass']))})"
+            f"(gate={yes_no(bool(exec_surface['gate_pass']))})\n"
         )
-    if scan_serial_default:
-        lines.append(f"- Benchmark serial scan (`default`): **{scan_serial_default[1]}**")
-    if scan_serial_parallel and scan_parallel_parallel:
-        lines.append(
+    if serial_default_label is not None:
+        w(f"- Benchmark serial scan (`default`): **{serial_default_label}**\n")
+    if serial_parallel_label is not None and parallel_parallel_label is not None:
+        w(
             "- Benchmark scan in `parallel` feature run: "
-            f"serial={scan_serial_parallel[1]}, parallel={scan_parallel_parallel[1]}"
+            f"serial={serial_parallel_label}, parallel={parallel_parallel_label}\n"
         )
     if scan_speedup is not None:
-        lines.append(f"- Scan speedup (`serial/parallel`, parallel feature run): **{scan_speedup:.2f}x**")
-    lines.append("")
-    lines.append("## Claim Gates")
-    lines.append("")
-    lines.append("| Claim | Gate | Status |")
-    lines.append("|---|---|---|")
-    lines.append(
+        w(f"- Scan speedup (`serial/parallel`, parallel feature run): **{scan_speedup:.2f}x**\n")
+    w(
+        "\n## Claim Gates\n\n"
+        "| Claim | Gate | Status |\n"
+        "|---|---|---|\n"
         "| Numerical parity on covered workloads | `diff fail == 0` | "
-        f"**{yes_no(differential_gate)}** |"
-    )
-    lines.append(
+        f"**{yes_no(differential_gate)}** |\n"
         "| Full symbol/function traceability | `traceability unresolved == 0` | "
-        f"**{yes_no(traceability_gate)}** |"
-    )
-    lines.append(
+        f"**{yes_no(traceability_gate)}** |\n"
         "| ROOT P0 regression parity completeness | `known P0 gaps == 0` | "
-        f"**{yes_no(root_p0_gate)}** |"
-    )
-    lines.append(
+        f"**{yes_no(root_p0_gate)}** |\n"
         "| Executed-surface mapping completeness | `executed-surface P0/P1 == 0` | "
-        f"**{yes_no(executed_surface_gate)}** |"
-    )
-    lines.append(
+        f"**{yes_no(executed_surface_gate)}** |\n"
         "| Full 1:1 functional coverage claim | all above gates true | "
-        f"**{yes_no(full_1to1_gate)}** |"
-    )
-    lines.append(
+        f"**{yes_no(full_1to1_gate)}** |\n"
         "| Full 100% verifiable coverage claim | 1:1 gate + zero warnings | "
-        f"**{yes_no(full_100_verifiable)}** |"
+        f"**{yes_no(full_100_verifiable)}** |\n"
+        "\n## Blocking Gaps\n\n"
     )
-    lines.append("")
-    lines.append("## Blocking Gaps")
-    lines.append("")
     if not traceability_gate:
-        lines.append("- Unresolved traceability still present. Top unresolved upstream files:")
+        w("- Unresolved traceability still present. Top unresolved upstream files:\n")
         for upstream_file, count in top_unresolved:
-            lines.append(f"  - `{upstream_file}`: {count}")
+            w(f"  - `{upstream_file}`: {count}\n")
     if not root_p0_gate:
-        lines.append("- Known ROOT P0 test-port gap(s) remain; see `reports/verification/root_test_port_status.md`.")
+        w("- Known ROOT P0 test-port gap(s) remain; see `reports/verification/root_test_port_status.md`.\n")
     if not executed_surface_gate:
-        lines.append("- Executed-surface mapping gate fails; see `reports/verification/executed_surface_mapping.md`.")
+        w("- Executed-surface mapping gate fails; see `reports/verification/executed_surface_mapping.md`.\n")
     if diff_counts["warn"] > 0:
-        lines.append("- Differential warnings remain (NFCN divergence); see `reports/verification/diff_summary.md`.")
+        w("- Differential warnings remain (NFCN divergence); see `reports/verification/diff_summary.md`.\n")
     if traceability_gate and root_p0_gate and executed_surface_gate and diff_counts["warn"] == 0:
-        lines.append("- None.")
-    lines.append("")
-    lines.append("## Reproduce")
-    lines.append("")
-    lines.append("```bash")
-    lines.append("scripts/build_root_reference_runner.sh v6-36-08")
-    lines.append("python3 scripts/compare_ref_vs_rust.py")
-    lines.append("python3 scripts/generate_traceability_matrix.py")
-    lines.append("python3 scripts/check_traceability_gate.py --mode non-regression")
-    lines.append("python3 scripts/generate_executed_surface_mapping.py")
-    lines.append("python3 scripts/check_executed_surface_gate.py --mode non-regression")
-    lines.append("cargo test --no-default-features")
-    lines.append("PYO3_USE_ABI3_FORWARD_COMPATIBILITY=1 cargo test --all-features")
-    lines.append("cargo llvm-cov --no-default-features --summary-only > reports/coverage/core_coverage_raw.txt")
-    lines.append("PYO3_USE_ABI3_FORWARD_COMPATIBILITY=1 cargo llvm-cov --all-features --summary-only > reports/coverage/all_features_coverage_raw.txt")
-    lines.append("python3 scripts/generate_coverage_reports.py")
-    lines.append("python3 scripts/generate_reference_coverage.py --root-tag v6-36-08")
-    lines.append("cargo bench --bench benchmarks -- --noplot > reports/benchmarks/default_raw.txt")
-    lines.append("cargo bench --features parallel --bench benchmarks -- --noplot > reports/benchmarks/parallel_raw.txt")
-    lines.append("python3 scripts/generate_benchmark_report.py")
-    lines.append("python3 scripts/generate_verification_scorecard.py")
-    lines.append("```")
-    lines.append("")
-
-    OUT_SCORECARD_PATH.write_text("\n".join(lines) + "\n")
+        w("- None.\n")
+    w(
+        "\n## Reproduce\n\n"
+        "```bash\n"
+        "scripts/build_root_reference_runner.sh v6-36-08\n"
+        "python3 scripts/compare_ref_vs_rust.py\n"
+        "python3 scripts/generate_traceability_matrix.py\n"
+        "python3 scripts/check_traceability_gate.py --mode non-regression\n"
+        "python3 scripts/generate_executed_surface_mapping.py\n"
+        "python3 scripts/check_executed_surface_gate.py --mode non-regression\n"
+        "cargo test --no-default-features\n"
+        "PYO3_USE_ABI3_FORWARD_COMPATIBILITY=1 cargo test --all-features\n"
+        "cargo llvm-cov --no-default-features --summary-only > reports/coverage/core_coverage_raw.txt\n"
+        "PYO3_USE_ABI3_FORWARD_COMPATIBILITY=1 cargo llvm-cov --all-features --summary-only"
+        " > reports/coverage/all_features_coverage_raw.txt\n"
+        "python3 scripts/generate_coverage_reports.py\n"
+        "python3 scripts/generate_reference_coverage.py --root-tag v6-36-08\n"
+        "cargo bench --bench benchmarks -- --noplot > reports/benchmarks/default_raw.txt\n"
+        "cargo bench --features parallel --bench benchmarks -- --noplot > reports/benchmarks/parallel_raw.txt\n"
+        "python3 scripts/generate_benchmark_report.py\n"
+        "python3 scripts/generate_verification_scorecard.py\n"
+        "```\n\n"
+    )
+
+    write_text_atomic(OUT_SCORECARD_PATH, buf.getvalue())
     print(f"Wrote {OUT_MANIFEST_PATH.relative_to(REPO_ROOT)}")
     print(f"Wrote {OUT_SCORECARD_PATH.relative_to(REPO_ROOT)}")
     return 0